@@ -0,0 +1,350 @@
+"""Incrementally maintained rating aggregates."""
+
+import itertools
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+
+class RangeAverageIndex:
+    """
+    Fenwick trees over day ordinals holding daily averages.
+
+    One tree sums the daily averages, the other counts rated days, so the
+    average of rated days in any [start, end] window takes O(log n), and
+    changing one day's average is an O(log n) point update. The covered
+    ordinal range grows (with a rebuild) when a day outside it is set.
+    """
+
+    PADDING_DAYS = 366
+
+    def __init__(self):
+        self._values = {}  # ordinal -> daily average
+        self._base = 0
+        self._size = 0
+        self._sums = [0.0]
+        self._counts = [0]
+
+    def rebuild(self, values: Dict[int, float]):
+        """Build both trees in O(n) from ordinal -> daily average."""
+        self._values = {ordinal: value for ordinal, value in values.items() if value > 0}
+        if self._values:
+            low = min(self._values) - self.PADDING_DAYS
+            high = max(self._values) + self.PADDING_DAYS
+        else:
+            today = date.today().toordinal()
+            low, high = today - self.PADDING_DAYS, today + self.PADDING_DAYS
+        self._base = low
+        self._size = high - low + 1
+        sums = [0.0] * (self._size + 1)
+        counts = [0] * (self._size + 1)
+        for ordinal, value in self._values.items():
+            i = ordinal - self._base + 1
+            sums[i] += value
+            counts[i] += 1
+        for i in range(1, self._size + 1):
+            parent = i + (i & -i)
+            if parent <= self._size:
+                sums[parent] += sums[i]
+                counts[parent] += counts[i]
+        self._sums = sums
+        self._counts = counts
+
+    def get(self, ordinal: int) -> float:
+        """Daily average stored for a day, 0.0 if unrated."""
+        return self._values.get(ordinal, 0.0)
+
+    def set(self, ordinal: int, value: float):
+        """Set a day's average (0 marks the day unrated)."""
+        if not self._base <= ordinal < self._base + self._size:
+            values = dict(self._values)
+            if value > 0:
+                values[ordinal] = value
+            self.rebuild(values)
+            return
+        old = self._values.get(ordinal, 0.0)
+        delta_sum = value - old
+        delta_count = (1 if value > 0 else 0) - (1 if old > 0 else 0)
+        if value > 0:
+            self._values[ordinal] = value
+        else:
+            self._values.pop(ordinal, None)
+        i = ordinal - self._base + 1
+        while i <= self._size:
+            self._sums[i] += delta_sum
+            self._counts[i] += delta_count
+            i += i & -i
+
+    def range_average(self, start: int, end: int) -> float:
+        """Average of daily averages over rated days with start <= ordinal <= end."""
+        total, count = self.range_totals(start, end)
+        if count <= 0:
+            return 0.0
+        return total / count
+
+    def range_totals(self, start: int, end: int) -> Tuple[float, int]:
+        """(sum of daily averages, rated days) with start <= ordinal <= end."""
+        total, count = self._prefix(end)
+        before_total, before_count = self._prefix(start - 1)
+        return total - before_total, count - before_count
+
+    def _prefix(self, ordinal: int):
+        i = min(ordinal - self._base + 1, self._size)
+        total = 0.0
+        count = 0
+        while i > 0:
+            total += self._sums[i]
+            count += self._counts[i]
+            i -= i & -i
+        return total, count
+
+
+class DailyAggregates:
+    """
+    Holds (sum, count) of ratings per date.
+
+    Kept in sync with daily_ratings by calling update() on every change,
+    so a daily average is a single dictionary lookup. Also maintains the
+    all-time aggregate (sum of daily averages, number of rated days), which
+    each update adjusts only for the day that changed, and a
+    RangeAverageIndex for averages over arbitrary date windows.
+
+    ``version`` changes on every mutation and is unique across instances,
+    so it can key caches of derived data.
+    """
+
+    _versions = itertools.count(1)
+
+    def __init__(self):
+        self._days = {}  # date_str -> [sum, count]
+        self._total_sum = 0.0
+        self._total_days = 0
+        self.ranges = RangeAverageIndex()
+        self.version = next(self._versions)
+
+    def rebuild(self, daily_ratings: Dict[str, Dict[str, int]]):
+        """Recompute all aggregates from scratch (used at load time)."""
+        self._days = {}
+        for date_str, ratings in daily_ratings.items():
+            values = [rating for rating in ratings.values() if rating > 0]
+            if values:
+                self._days[date_str] = [sum(values), len(values)]
+        self._total_sum = sum(s / c for s, c in self._days.values())
+        self._total_days = len(self._days)
+        self.ranges.rebuild({date.fromisoformat(date_str).toordinal(): s / c
+                             for date_str, (s, c) in self._days.items()})
+        self.version = next(self._versions)
+
+    def update(self, date_str: str, old: int, new: int):
+        """
+        Account for one task's rating on a day changing from old to new.
+
+        Args:
+            date_str: Day in YYYY-MM-DD format
+            old: Previous rating (0 if unrated)
+            new: New rating (0 if removed)
+        """
+        entry = self._days.get(date_str)
+        if entry is None:
+            entry = self._days[date_str] = [0, 0]
+        else:
+            self._total_sum -= entry[0] / entry[1]
+            self._total_days -= 1
+        if old > 0:
+            entry[0] -= old
+            entry[1] -= 1
+        if new > 0:
+            entry[0] += new
+            entry[1] += 1
+        if entry[1] == 0:
+            del self._days[date_str]
+            day_average = 0.0
+        else:
+            day_average = entry[0] / entry[1]
+            self._total_sum += day_average
+            self._total_days += 1
+        self.ranges.set(date.fromisoformat(date_str).toordinal(), day_average)
+        self.version = next(self._versions)
+
+    def set_day(self, date_str: str, ratings: Dict[str, int]):
+        """
+        Replace the aggregate of one day with that of the given ratings.
+
+        Used to build the aggregates while a data file is still being parsed,
+        and to refresh days that a journal replay changed afterwards.
+        """
+        entry = self._days.pop(date_str, None)
+        if entry is not None:
+            self._total_sum -= entry[0] / entry[1]
+            self._total_days -= 1
+        values = [rating for rating in ratings.values() if rating > 0]
+        day_average = 0.0
+        if values:
+            self._days[date_str] = [sum(values), len(values)]
+            day_average = sum(values) / len(values)
+            self._total_sum += day_average
+            self._total_days += 1
+        self.ranges.set(date.fromisoformat(date_str).toordinal(), day_average)
+        self.version = next(self._versions)
+
+    def average(self, date_str: str) -> float:
+        """Average rating of a day, 0.0 if the day has no ratings."""
+        entry = self._days.get(date_str)
+        if entry is None:
+            return 0.0
+        return entry[0] / entry[1]
+
+    def add_external(self, total: float, days: int):
+        """
+        Add (sum of daily averages, rated days) of days kept outside this cache.
+
+        Used for months that are not loaded; pass negative values to take a
+        month's summary back out once its ratings are loaded.
+        """
+        self._total_sum += total
+        self._total_days += days
+        self.version = next(self._versions)
+
+    def overall_average(self) -> float:
+        """Average of daily averages over all rated days."""
+        if self._total_days == 0:
+            return 0.0
+        return self._total_sum / self._total_days
+
+    def average_on(self, day: date) -> float:
+        """Average rating of a day given as a date, without string formatting."""
+        return self.ranges.get(day.toordinal())
+
+    def range_average(self, start: date, end: date) -> float:
+        """Average of daily averages over rated days in [start, end]."""
+        return self.ranges.range_average(start.toordinal(), end.toordinal())
+
+    def range_totals(self, start: date, end: date) -> Tuple[float, int]:
+        """(sum of daily averages, rated days) over [start, end], to combine with external totals."""
+        return self.ranges.range_totals(start.toordinal(), end.toordinal())
+
+
+class WorkspaceIndex:
+    """
+    Secondary index from workspace to its tasks, plus per-day workspace aggregates.
+
+    Task ids are kept per workspace in insertion order (a dict used as an
+    ordered set). Ratings are aggregated as (sum, count) per workspace and
+    day, so a workspace tile is a single lookup.
+    """
+
+    def __init__(self):
+        self._tasks = {}  # workspace -> {task_id: None}
+        self._workspace_of = {}  # task_id -> workspace
+        self._days = {}  # workspace -> {date_str: [sum, count]}
+
+    def rebuild(self, global_tasks: Dict[str, dict], daily_ratings: Dict[str, Dict[str, int]]):
+        """Recompute the index from scratch (used at load time)."""
+        self._tasks = {}
+        self._workspace_of = {}
+        self._days = {}
+        for task_id, task in global_tasks.items():
+            self.add_task(task_id, task.get('workspace'))
+        for date_str, ratings in daily_ratings.items():
+            for task_id, rating in ratings.items():
+                self.update_rating(date_str, task_id, 0, rating)
+
+    def tasks(self, workspace: str):
+        """Task ids of a workspace in insertion order."""
+        return self._tasks.get(workspace, {}).keys()
+
+    def add_task(self, task_id: str, workspace: str):
+        """Register a new task (it must not have ratings yet)."""
+        self._tasks.setdefault(workspace, {})[task_id] = None
+        self._workspace_of[task_id] = workspace
+
+    def remove_task(self, task_id: str):
+        """Forget a task; its ratings must have been cleared first."""
+        workspace = self._workspace_of.pop(task_id, None)
+        if workspace is not None:
+            self._tasks[workspace].pop(task_id, None)
+
+    def move_task(self, task_id: str, workspace: str, ratings: Iterable[Tuple[str, int]]):
+        """
+        Move a task to another workspace together with its ratings.
+
+        Args:
+            task_id: Task to move
+            workspace: Target workspace
+            ratings: The task's (date_str, rating) pairs
+        """
+        ratings = list(ratings)
+        for date_str, rating in ratings:
+            self.update_rating(date_str, task_id, rating, 0)
+        self.remove_task(task_id)
+        self.add_task(task_id, workspace)
+        for date_str, rating in ratings:
+            self.update_rating(date_str, task_id, 0, rating)
+
+    def update_rating(self, date_str: str, task_id: str, old: int, new: int):
+        """Account for a task's rating on a day changing from old to new."""
+        workspace = self._workspace_of.get(task_id)
+        if workspace is None:
+            return
+        days = self._days.setdefault(workspace, {})
+        entry = days.setdefault(date_str, [0, 0])
+        if old > 0:
+            entry[0] -= old
+            entry[1] -= 1
+        if new > 0:
+            entry[0] += new
+            entry[1] += 1
+        if entry[1] == 0:
+            del days[date_str]
+
+    def day_average(self, date_str: str, workspace: str) -> float:
+        """Average rating of a workspace's tasks on a day, 0.0 if none rated."""
+        entry = self._days.get(workspace, {}).get(date_str)
+        if entry is None:
+            return 0.0
+        return entry[0] / entry[1]
+
+    def overall_average(self, workspace: str) -> Tuple[float, int]:
+        """(average of a workspace's daily averages, rated days) over all days."""
+        days = self._days.get(workspace, {})
+        if not days:
+            return 0.0, 0
+        return sum(total / count for total, count in days.values()) / len(days), len(days)
+
+
+class TaskDateIndex:
+    """
+    Reverse index from task id to the dates it has a rating on.
+
+    Lets task deletion and per-task history queries cost O(task's history)
+    instead of scanning every stored day.
+    """
+
+    def __init__(self):
+        self._dates = {}  # task_id -> {date_str: None}
+
+    def rebuild(self, daily_ratings: Dict[str, Dict[str, int]]):
+        """Recompute the index from scratch (used at load time)."""
+        self._dates = {}
+        for date_str in sorted(daily_ratings):
+            for task_id, rating in daily_ratings[date_str].items():
+                if rating > 0:
+                    self._dates.setdefault(task_id, {})[date_str] = None
+
+    def update(self, date_str: str, task_id: str, rating: int):
+        """Record that a task's rating on a day was set (or cleared with 0)."""
+        if rating > 0:
+            self._dates.setdefault(task_id, {})[date_str] = None
+        else:
+            dates = self._dates.get(task_id)
+            if dates is not None:
+                dates.pop(date_str, None)
+                if not dates:
+                    del self._dates[task_id]
+
+    def dates(self, task_id: str) -> List[str]:
+        """Dates a task was rated on, sorted."""
+        return sorted(self._dates.get(task_id, ()))
+
+    def history(self, task_id: str, daily_ratings: Dict[str, Dict[str, int]]) -> Dict[str, int]:
+        """All ratings of one task as date -> rating, sorted by date."""
+        return {date_str: daily_ratings[date_str][task_id] for date_str in self.dates(task_id)}
@@ -0,0 +1,307 @@
+"""Benchmarks of the load, save, aggregate and render paths on synthetic data.
+
+Usage:
+    python3 benchmark.py [--years 3] [--tasks 40] [--workspaces 4] [--density 0.6]
+                         [--repeat 20] [--seed 0] [--keep DIR] [--output results.json]
+
+Results are printed (or written) as JSON so runs of different versions can
+be compared. Timings are in milliseconds. The calendar is drawn on a
+recording stand-in canvas; the window-level benchmarks need a display and
+are reported as skipped without one.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from aggregates import DailyAggregates, TaskDateIndex, WorkspaceIndex
+from config import DEFAULT_WORKSPACES
+from data_manager import DataManager
+
+
+def generate_data(years: float = 3, tasks: int = 40, workspaces: int = 4,
+                  density: float = 0.6, seed: int = 0,
+                  end: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Generate a realistic data set.
+
+    Each task belongs to a workspace and has its own typical rating; on each
+    day it is rated with probability ``density``.
+
+    Args:
+        years: Length of the rating history ending on ``end``
+        tasks: Number of tasks
+        workspaces: Number of workspaces
+        density: Probability that a task is rated on a given day
+        seed: Random seed, so runs are comparable
+        end: Last day of the history (default today)
+
+    Returns:
+        Dictionary with 'global_tasks', 'daily_ratings', and 'workspaces'
+    """
+    rng = random.Random(seed)
+    names = list(DEFAULT_WORKSPACES[:workspaces])
+    names += [f"Пространство {i + 1}" for i in range(len(names), workspaces)]
+
+    global_tasks = {}
+    typical = {}
+    for i in range(tasks):
+        task_id = f"task_{i}"
+        global_tasks[task_id] = {
+            'description': f"Задача {i + 1}",
+            'workspace': names[i % len(names)] if names else None,
+            'description_criteria': ''
+        }
+        typical[task_id] = rng.uniform(2.0, 4.5)
+
+    end = end or date.today()
+    start = end - timedelta(days=int(years * 365))
+    daily_ratings = {}
+    day = start
+    while day <= end:
+        ratings = {}
+        for task_id, mean in typical.items():
+            if rng.random() < density:
+                ratings[task_id] = min(5, max(1, round(rng.gauss(mean, 1.0))))
+        if ratings:
+            daily_ratings[day.isoformat()] = ratings
+        day += timedelta(days=1)
+    return {'global_tasks': global_tasks, 'daily_ratings': daily_ratings, 'workspaces': names}
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Run fn repeat times and summarize the wall times in milliseconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return {
+        'runs': repeat,
+        'min_ms': times[0],
+        'median_ms': statistics.median(times),
+        'p95_ms': times[min(len(times) - 1, int(len(times) * 0.95))],
+        'max_ms': times[-1],
+        'mean_ms': statistics.fmean(times)
+    }
+
+
+class RecordingCanvas:
+    """
+    Stand-in for tk.Canvas that records calls instead of drawing.
+
+    Supports the methods CalendarComponent uses and counts calls per method,
+    so a benchmark can report how many canvas operations an update costs.
+    """
+
+    def __init__(self, width: int = 420, height: int = 380):
+        self.width = width
+        self.height = height
+        self.calls: Dict[str, int] = {}
+        self._next_id = 0
+
+    def _record(self, name: str):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _create(self, name: str) -> int:
+        self._record(name)
+        self._next_id += 1
+        return self._next_id
+
+    def create_text(self, *args, **kwargs) -> int:
+        return self._create('create_text')
+
+    def create_oval(self, *args, **kwargs) -> int:
+        return self._create('create_oval')
+
+    def coords(self, *args):
+        self._record('coords')
+
+    def itemconfigure(self, *args, **kwargs):
+        self._record('itemconfigure')
+
+    def bind(self, *args):
+        self._record('bind')
+
+    def after(self, *args):
+        self._record('after')
+
+    def winfo_width(self) -> int:
+        return self.width
+
+    def winfo_height(self) -> int:
+        return self.height
+
+    def take_calls(self) -> Dict[str, int]:
+        """Return and reset the call counts."""
+        calls, self.calls = self.calls, {}
+        return calls
+
+
+def bench_storage(path: str, data: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """Time DataManager.load_data/save_data and the load-time index build."""
+    manager = DataManager(data_file=path, journaled=False, rating_model='dict')
+    results = {
+        'save_data': measure(lambda: manager.save_data(data['global_tasks'], data['daily_ratings'],
+                                                       data['workspaces']), repeat),
+        'file_bytes': os.path.getsize(path),
+        'load_data': measure(lambda: DataManager(data_file=path, journaled=False).load_data(), repeat)
+    }
+
+    def build_indexes():
+        DailyAggregates().rebuild(data['daily_ratings'])
+        WorkspaceIndex().rebuild(data['global_tasks'], data['daily_ratings'])
+        TaskDateIndex().rebuild(data['daily_ratings'])
+
+    results['index_build'] = measure(build_indexes, repeat)
+    return results
+
+
+def bench_calendar(data: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """Time CalendarComponent.update_calendar on a recording canvas."""
+    from ui import CalendarComponent, StyleManager
+
+    aggregates = DailyAggregates()
+    aggregates.rebuild(data['daily_ratings'])
+    canvas = RecordingCanvas()
+    calendar = CalendarComponent(StyleManager(), aggregates.average, lambda: aggregates.version)
+    calendar.attach_canvas(canvas)
+    canvas.take_calls()
+
+    def on_day_click(date_str):
+        pass
+
+    results = {}
+    start = time.perf_counter()
+    calendar.update_calendar(on_day_click)
+    results['first_draw'] = {'ms': (time.perf_counter() - start) * 1000,
+                             'canvas_calls': canvas.take_calls()}
+
+    results['redraw_unchanged'] = measure(lambda: calendar.update_calendar(on_day_click), repeat)
+    results['redraw_unchanged']['canvas_calls'] = canvas.take_calls()
+
+    def switch_month():
+        calendar.next_month()
+        calendar.update_calendar(on_day_click)
+        calendar.previous_month()
+        calendar.update_calendar(on_day_click)
+
+    results['switch_month'] = measure(switch_month, repeat)
+    results['switch_month']['canvas_calls'] = canvas.take_calls()
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    ratings = data['daily_ratings'].setdefault(today, {})
+    task_id = next(iter(data['global_tasks']), 'task_0')
+
+    def change_rating():
+        old = ratings.get(task_id, 0)
+        new = old % 5 + 1
+        ratings[task_id] = new
+        aggregates.update(today, old, new)
+        calendar.update_calendar(on_day_click)
+
+    results['rating_change'] = measure(change_rating, repeat)
+    results['rating_change']['canvas_calls'] = canvas.take_calls()
+    return results
+
+
+def bench_app(path: str, repeat: int) -> Dict[str, Any]:
+    """Time ModernTaskManager methods in a withdrawn window (needs a display)."""
+    try:
+        import customtkinter as ctk
+        from main import ModernTaskManager
+        root = ctk.CTk()
+    except Exception as e:
+        return {'skipped': f"{type(e).__name__}: {e}"}
+    app = None
+    try:
+        root.withdraw()
+        app = ModernTaskManager(root, data_manager=DataManager(data_file=path))
+        # Pump events until the background load has built the panels
+        deadline = time.perf_counter() + 120
+        while not hasattr(app, 'calendar') and time.perf_counter() < deadline:
+            root.update()
+            time.sleep(0.005)
+        if not hasattr(app, 'calendar'):
+            return {'skipped': "data did not load within 120 s"}
+
+        today = datetime.now().strftime("%Y-%m-%d")
+        dates = list(app.daily_ratings.keys())
+        results = {
+            'get_daily_rating': measure(lambda: [app.get_daily_rating(d) for d in dates], repeat),
+            'get_daily_rating_days': len(dates),
+            'update_big_metrics': measure(lambda: app.update_big_metrics(today), repeat),
+            'update_workspace_tiles': measure(app.update_workspace_tiles, repeat),
+        }
+        root.update_idletasks()
+        return results
+    finally:
+        if app is not None:
+            app.save_scheduler.close()
+        root.destroy()
+
+
+def run(years: float, tasks: int, workspaces: int, density: float, repeat: int,
+        seed: int = 0, keep: Optional[str] = None) -> Dict[str, Any]:
+    """Generate a data set, run every benchmark and return the results."""
+    start = time.perf_counter()
+    data = generate_data(years, tasks, workspaces, density, seed)
+    generated_ms = (time.perf_counter() - start) * 1000
+
+    directory = keep or tempfile.mkdtemp(prefix='tracker-bench-')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, 'task_data.json')
+    try:
+        results = {
+            'params': {'years': years, 'tasks': tasks, 'workspaces': workspaces,
+                       'density': density, 'repeat': repeat, 'seed': seed},
+            'environment': {'python': platform.python_version(), 'platform': platform.platform()},
+            'data': {'days': len(data['daily_ratings']),
+                     'ratings': sum(len(r) for r in data['daily_ratings'].values()),
+                     'generate_ms': generated_ms},
+            'storage': bench_storage(path, data, repeat),
+            'calendar': bench_calendar(data, repeat),
+            'app': bench_app(path, repeat)
+        }
+    finally:
+        if keep is None:
+            shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the tracker on synthetic data")
+    parser.add_argument('--years', type=float, default=3)
+    parser.add_argument('--tasks', type=int, default=40)
+    parser.add_argument('--workspaces', type=int, default=4)
+    parser.add_argument('--density', type=float, default=0.6,
+                        help="probability that a task is rated on a day")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keep', help="keep the generated data file in this directory")
+    parser.add_argument('--output', help="write results to a file instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run(args.years, args.tasks, args.workspaces, args.density, args.repeat,
+                  seed=args.seed, keep=args.keep)
+    text = json.dumps(results, ensure_ascii=False, indent=2) + '\n'
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
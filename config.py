@@ -1,7 +1,5 @@
 """Configuration module for Modern Task Manager."""
 
-import customtkinter as ctk
-
 # Modern color scheme for CustomTkinter
 COLORS = {
     'bg': '#1a1a2e',
@@ -19,11 +17,45 @@ DEFAULT_WORKSPACES = ["Развитие", "Bug Bounty", "CTF", "Трениров
 
 # File settings
 DATA_FILE = "task_data.json"
+SQLITE_FILE = "task_data.db"
+SHARD_DIR = "task_data"
+
+# Storage backend: "json" (default), "sqlite" or "sharded" (one file per month)
+STORAGE_BACKEND = "json"
+
+# Snapshot format written by the "json" backend: "json" or "binary"
+# (compact, memory-mapped). Either format is detected when loading.
+SNAPSHOT_FORMAT = "json"
+
+# In-memory ratings: "dict" (date -> {task_id: rating}) or "matrix"
+# (compact int8 days x tasks matrix behind the same dict interface; it also
+# replaces the per-rating task -> dates index)
+RATING_MODEL = "dict"
+
+# Journal settings: mutations are appended to DATA_FILE + ".journal" and
+# folded into the snapshot once the journal holds this many records
+JOURNAL_ENABLED = True
+JOURNAL_COMPACT_THRESHOLD = 500
+
+# Autosave: bursts of mutations within this window are written as one snapshot
+AUTOSAVE_DELAY_MS = 1000
 
 # UI settings
 WINDOW_SIZE = "1100x750"
 WINDOW_TITLE = "Progress Tracker"
 
-# CustomTkinter settings
-ctk.set_appearance_mode("dark")
-ctk.set_default_color_theme("blue")
+# Task list: render only the visible rows (recommended for large workspaces)
+VIRTUALIZED_TASK_LIST = True
+
+# Startup: how often the Tk thread checks whether background loading finished
+LOAD_POLL_MS = 20
+
+# Instrumentation (main.py --instrument): latency report file and dump key
+INSTRUMENTATION_FILE = "instrumentation.json"
+INSTRUMENTATION_KEY = "<F12>"
+
+# Undo/redo: approximate memory budget of the undo and redo history
+UNDO_BUDGET_BYTES = 1_000_000
+
+# Calendar: delay after a redraw before neighbouring months are prefetched
+PREFETCH_DELAY_MS = 150
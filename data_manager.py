@@ -1,67 +1,559 @@
 """Data management module for persisting task data."""
 
-import json
-import os
-from typing import Dict, List, Any
+import queue
+import threading
+from array import array
+from collections.abc import MutableMapping
+from datetime import date
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
 
-from config import DATA_FILE
+from config import (DATA_FILE, SQLITE_FILE, SHARD_DIR, STORAGE_BACKEND, SNAPSHOT_FORMAT,
+                    JOURNAL_ENABLED, AUTOSAVE_DELAY_MS, RATING_MODEL)
+from storage import StorageBackend, create_backend, empty_data
+
+
+class RatingMatrix:
+    """
+    Dense days x tasks matrix of ratings stored as int8 (0 means unrated).
+
+    Rows are day ordinals relative to ``base``; columns are interned task
+    indexes, and columns of deleted tasks are reused. The flat ``array('b')``
+    costs one byte per (day, task) cell. Averages still come from the
+    per-day aggregate indexes; the task -> rated days index is a column
+    scan (see MatrixTaskDateIndex), so nothing keeps an entry per rating.
+    """
+
+    DAY_PADDING = 31
+
+    def __init__(self, task_capacity: int = 16):
+        self.base = 0
+        self.day_capacity = 0
+        self.task_capacity = task_capacity
+        self.task_index: Dict[str, int] = {}
+        self.task_ids: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._data = array('b')
+        self._counts = array('i')  # rated tasks per day row
+
+    # Interning and growth
+
+    def column(self, task_id: str, create: bool = False) -> Optional[int]:
+        """Column of a task, allocating one if ``create`` is set."""
+        col = self.task_index.get(task_id)
+        if col is None and create:
+            if self._free:
+                col = self._free.pop()
+                self.task_ids[col] = task_id
+            else:
+                col = len(self.task_ids)
+                if col >= self.task_capacity:
+                    self._resize(self.base, self.day_capacity, self.task_capacity * 2)
+                self.task_ids.append(task_id)
+            self.task_index[task_id] = col
+        return col
+
+    def _row(self, ordinal: int, create: bool = False) -> Optional[int]:
+        """Row of a day, growing the day range if ``create`` is set."""
+        row = ordinal - self.base
+        if 0 <= row < self.day_capacity:
+            return row
+        if not create:
+            return None
+        if self.day_capacity == 0:
+            low, high = ordinal - self.DAY_PADDING, ordinal + self.DAY_PADDING
+        else:
+            span = self.day_capacity
+            low = min(self.base, ordinal - span // 2)
+            high = max(self.base + self.day_capacity - 1, ordinal + span // 2)
+        self._resize(low, high - low + 1, self.task_capacity)
+        return ordinal - self.base
+
+    def _resize(self, base: int, day_capacity: int, task_capacity: int):
+        data = array('b', bytes(day_capacity * task_capacity))
+        counts = array('i', bytes(4 * day_capacity))
+        width = min(self.task_capacity, task_capacity)
+        for old_row in range(self.day_capacity):
+            if not self._counts[old_row]:
+                continue
+            new_row = old_row + self.base - base
+            start = old_row * self.task_capacity
+            data[new_row * task_capacity:new_row * task_capacity + width] = \
+                self._data[start:start + width]
+            counts[new_row] = self._counts[old_row]
+        self.base = base
+        self.day_capacity = day_capacity
+        self.task_capacity = task_capacity
+        self._data = data
+        self._counts = counts
+
+    # Cell access
+
+    def get(self, ordinal: int, task_id: str) -> int:
+        row = self._row(ordinal)
+        col = self.task_index.get(task_id)
+        if row is None or col is None:
+            return 0
+        return self._data[row * self.task_capacity + col]
+
+    def set(self, ordinal: int, task_id: str, rating: int) -> int:
+        """Set a rating (0 clears it) and return the previous value."""
+        if rating <= 0:
+            row = self._row(ordinal)
+            col = self.task_index.get(task_id)
+            if row is None or col is None:
+                return 0
+        else:
+            col = self.column(task_id, create=True)
+            row = self._row(ordinal, create=True)
+        i = row * self.task_capacity + col
+        old = self._data[i]
+        self._data[i] = max(rating, 0)
+        self._counts[row] += (rating > 0) - (old > 0)
+        return old
+
+    def remove_task(self, task_id: str):
+        """Clear a task's column and free it for reuse."""
+        col = self.task_index.pop(task_id, None)
+        if col is None:
+            return
+        stride = self.task_capacity
+        for row in range(self.day_capacity):
+            i = row * stride + col
+            if self._data[i]:
+                self._data[i] = 0
+                self._counts[row] -= 1
+        self.task_ids[col] = None
+        self._free.append(col)
+
+    def count(self, ordinal: int) -> int:
+        """Number of rated tasks on a day."""
+        row = self._row(ordinal)
+        return self._counts[row] if row is not None else 0
+
+    def rated_days(self) -> Iterator[int]:
+        """Ordinals of days with at least one rating, ascending."""
+        for row, count in enumerate(self._counts):
+            if count:
+                yield self.base + row
+
+    def task_days(self, task_id: str) -> Iterator[int]:
+        """Ordinals of days a task is rated on, ascending (one strided column read)."""
+        col = self.task_index.get(task_id)
+        if col is None:
+            return
+        for row, value in enumerate(self._data[col::self.task_capacity]):
+            if value:
+                yield self.base + row
+
+    def day_items(self, ordinal: int) -> Iterator[Tuple[str, int]]:
+        """(task_id, rating) pairs of a day."""
+        row = self._row(ordinal)
+        if row is None or not self._counts[row]:
+            return
+        start = row * self.task_capacity
+        for col, task_id in enumerate(self.task_ids):
+            value = self._data[start + col]
+            if value:
+                yield task_id, value
+
+
+class DayRatingsView(MutableMapping):
+    """dict-style task_id -> rating access to one day of a RatingMatrix."""
+
+    def __init__(self, matrix: RatingMatrix, ordinal: int):
+        self.matrix = matrix
+        self.ordinal = ordinal
+
+    def __getitem__(self, task_id: str) -> int:
+        value = self.matrix.get(self.ordinal, task_id)
+        if not value:
+            raise KeyError(task_id)
+        return value
+
+    def __setitem__(self, task_id: str, rating: int):
+        self.matrix.set(self.ordinal, task_id, rating)
+
+    def __delitem__(self, task_id: str):
+        if not self.matrix.set(self.ordinal, task_id, 0):
+            raise KeyError(task_id)
+
+    def __iter__(self) -> Iterator[str]:
+        return (task_id for task_id, _ in list(self.matrix.day_items(self.ordinal)))
+
+    def __len__(self) -> int:
+        return self.matrix.count(self.ordinal)
+
+
+class MatrixDailyRatings(MutableMapping):
+    """
+    Adapter giving the ``daily_ratings`` dict interface over a RatingMatrix.
+
+    ``ratings[date_str]`` is a live DayRatingsView; a date is present while
+    it has at least one rating. ``setdefault`` always returns the live view
+    so ``ratings.setdefault(day, {})[task_id] = value`` writes to the matrix.
+    """
+
+    def __init__(self, matrix: Optional[RatingMatrix] = None):
+        self.matrix = matrix or RatingMatrix()
+
+    @classmethod
+    def from_dict(cls, daily_ratings: Dict[str, Dict[str, int]]) -> 'MatrixDailyRatings':
+        ratings = cls()
+        for date_str in sorted(daily_ratings):
+            ordinal = date.fromisoformat(date_str).toordinal()
+            for task_id, rating in daily_ratings[date_str].items():
+                if rating > 0:
+                    ratings.matrix.set(ordinal, task_id, rating)
+        return ratings
+
+    def __getitem__(self, date_str: str) -> DayRatingsView:
+        ordinal = date.fromisoformat(date_str).toordinal()
+        if not self.matrix.count(ordinal):
+            raise KeyError(date_str)
+        return DayRatingsView(self.matrix, ordinal)
+
+    def __contains__(self, date_str) -> bool:
+        return bool(self.matrix.count(date.fromisoformat(date_str).toordinal()))
+
+    def __setitem__(self, date_str: str, ratings: Dict[str, int]):
+        view = self.setdefault(date_str)
+        view.clear()
+        for task_id, rating in ratings.items():
+            view[task_id] = rating
+
+    def __delitem__(self, date_str: str):
+        self[date_str].clear()
+
+    def __iter__(self) -> Iterator[str]:
+        return (date.fromordinal(ordinal).isoformat()
+                for ordinal in list(self.matrix.rated_days()))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.matrix.rated_days())
+
+    def setdefault(self, date_str: str, default=None) -> DayRatingsView:
+        return DayRatingsView(self.matrix, date.fromisoformat(date_str).toordinal())
+
+
+class MatrixTaskDateIndex:
+    """
+    TaskDateIndex interface answered from a RatingMatrix.
+
+    The matrix already knows which days each task is rated on, so nothing
+    is stored: update() and rebuild() are no-ops and dates() scans the
+    task's column.
+    """
+
+    def __init__(self, matrix: RatingMatrix):
+        self.matrix = matrix
+
+    def rebuild(self, daily_ratings):
+        """Nothing to build; the matrix is the index."""
+
+    def update(self, date_str: str, task_id: str, rating: int):
+        """Nothing to record; the matrix is updated by the rating itself."""
+
+    def dates(self, task_id: str) -> List[str]:
+        """Dates a task was rated on, sorted."""
+        return [date.fromordinal(ordinal).isoformat()
+                for ordinal in self.matrix.task_days(task_id)]
+
+    def history(self, task_id: str, daily_ratings=None) -> Dict[str, int]:
+        """All ratings of one task as date -> rating, sorted by date."""
+        return {date.fromordinal(ordinal).isoformat(): self.matrix.get(ordinal, task_id)
+                for ordinal in self.matrix.task_days(task_id)}
 
 
 class DataManager:
-    """Handles all data persistence operations."""
-    
-    def __init__(self, data_file: str = DATA_FILE):
-        self.data_file = data_file
-    
-    def load_data(self) -> Dict[str, Any]:
+    """Handles all data persistence operations through a storage backend."""
+
+    def __init__(self, data_file: Optional[str] = None, journaled: bool = JOURNAL_ENABLED,
+                 backend: Optional[StorageBackend] = None, rating_model: str = RATING_MODEL):
+        if backend is None:
+            if data_file is None:
+                data_file = {'sqlite': SQLITE_FILE,
+                             'sharded': SHARD_DIR}.get(STORAGE_BACKEND, DATA_FILE)
+            backend = create_backend(STORAGE_BACKEND, data_file, journaled=journaled,
+                                     snapshot_format=SNAPSHOT_FORMAT)
+        self.backend = backend
+        self.rating_model = rating_model
+
+    @property
+    def incremental(self) -> bool:
+        """True if mutations are persisted record by record via append_changes."""
+        return self.backend.incremental
+
+    @property
+    def lazy(self) -> bool:
+        """True if ratings are loaded month by month (load_month)."""
+        return self.backend.lazy
+
+    @property
+    def load_complete(self) -> bool:
+        """False if the last load recovered only part of a damaged data file."""
+        return self.backend.load_complete
+
+    def is_month_loaded(self, year: int, month: int) -> bool:
+        """Check whether a month's ratings are in memory (always True unless lazy)."""
+        return not self.lazy or self.backend.is_month_loaded(year, month)
+
+    def load_month(self, year: int, month: int) -> Tuple[Dict[str, Dict[str, int]], Tuple[float, int]]:
+        """
+        Load one month of ratings from a lazy backend.
+
+        Returns:
+            The month's ratings and its stored (sum of daily averages, rated days)
+            summary, which was counted in unloaded_totals() until now
+        """
+        summary = self.backend.month_summary(year, month)
+        ratings = self.backend.load_month(year, month)
+        if self.rating_model == 'matrix':
+            ratings = MatrixDailyRatings.from_dict(ratings)
+        return ratings, summary
+
+    def unloaded_months(self) -> List[Tuple[int, int]]:
+        """(year, month) of stored months that are not loaded yet."""
+        return self.backend.unloaded_months() if self.lazy else []
+
+    def unloaded_totals(self, first: Optional[Tuple[int, int]] = None,
+                        last: Optional[Tuple[int, int]] = None) -> Tuple[float, int]:
         """
-        Load data from JSON file.
-        
+        (sum of daily averages, rated days) over months not loaded yet.
+
+        Args:
+            first: Only count months from this (year, month) on
+            last: Only count months up to this (year, month)
+        """
+        return self.backend.unloaded_totals(first, last) if self.lazy else (0.0, 0)
+
+    def load_data(self, on_progress: Optional[Callable[[float], None]] = None,
+                  on_day: Optional[Callable[[str, Dict[str, int]], None]] = None) -> Dict[str, Any]:
+        """
+        Load data from the storage backend.
+
+        Args:
+            on_progress: Called with the fraction loaded (streaming backends only)
+            on_day: Called with (date_str, ratings) for every loaded day, so
+                aggregates can be built while a large file is still parsing
+
         Returns:
             Dictionary with 'global_tasks', 'daily_ratings', and 'workspaces'
         """
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return {
-                        'global_tasks': data.get('global_tasks', {}),
-                        'daily_ratings': data.get('daily_ratings', {}),
-                        'workspaces': data.get('workspaces', [])
-                    }
-            except Exception:
-                return self._get_empty_data()
-        return self._get_empty_data()
-    
+        try:
+            if self.backend.streaming:
+                data = self.backend.load(on_progress=on_progress, on_day=on_day)
+            else:
+                data = self.backend.load()
+                if on_day:
+                    for date_str, ratings in data['daily_ratings'].items():
+                        on_day(date_str, ratings)
+        except Exception:
+            data = self._get_empty_data()
+        if self.rating_model == 'matrix':
+            data['daily_ratings'] = MatrixDailyRatings.from_dict(data['daily_ratings'])
+        return data
+
     def save_data(self, global_tasks: Dict, daily_ratings: Dict, workspaces: List) -> bool:
         """
-        Save data to JSON file.
-        
+        Save a full snapshot of the data.
+
+        For the journaled JSON backend this is the compaction step.
+
         Args:
             global_tasks: Dictionary of global tasks
             daily_ratings: Dictionary of daily ratings
             workspaces: List of workspace names
-            
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.write_snapshot(self.snapshot(global_tasks, daily_ratings, workspaces))
+
+    def snapshot(self, global_tasks: Dict, daily_ratings: Dict, workspaces: List) -> Dict[str, Any]:
+        """Copy the mutable state so it can be written off the main thread."""
+        return self.backend.snapshot(global_tasks, daily_ratings, workspaces)
+
+    def write_snapshot(self, snapshot: Dict[str, Any]) -> bool:
+        """
+        Write a snapshot through the backend. Safe to call from a worker thread.
+
         Returns:
             True if successful, False otherwise
         """
         try:
-            data = {
-                'global_tasks': global_tasks,
-                'daily_ratings': daily_ratings,
-                'workspaces': workspaces
-            }
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            self.backend.write_snapshot(snapshot)
             return True
         except Exception:
             return False
-    
+
+    def append_changes(self, changes: List[Dict[str, Any]]) -> bool:
+        """
+        Persist mutation records incrementally.
+
+        Args:
+            changes: Records in the format understood by apply_change
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.backend.append_changes(changes)
+            return True
+        except Exception:
+            return False
+
+    def needs_compaction(self) -> bool:
+        """Check whether incremental records should be folded into a snapshot."""
+        return self.backend.needs_compaction()
+
+    def close(self):
+        """Release backend resources."""
+        self.backend.close()
+
     def _get_empty_data(self) -> Dict[str, Any]:
         """Return empty data structure."""
-        return {
-            'global_tasks': {},
-            'daily_ratings': {},
-            'workspaces': []
-        }
+        return empty_data()
+
+
+class SaveScheduler:
+    """
+    Persists mutation records and coalesced snapshots on a background thread.
+
+    Timers run through the Tk event loop (``root.after``), so the state is
+    copied on the main thread; serialization and disk IO happen on the
+    worker. Change records and snapshots are written in the order they were
+    queued. Results are polled back on the main thread, where ``on_error``
+    is invoked and a snapshot is scheduled once the backend needs compaction.
+    """
+
+    POLL_INTERVAL_MS = 50
+
+    def __init__(self, data_manager: DataManager, get_state: Callable[[], Dict[str, Any]],
+                 schedule: Callable, cancel: Callable,
+                 on_error: Optional[Callable[[], None]] = None,
+                 delay_ms: int = AUTOSAVE_DELAY_MS):
+        """
+        Args:
+            data_manager: Manager used to snapshot and write the data
+            get_state: Returns dict with 'global_tasks', 'daily_ratings', 'workspaces'
+            schedule: ``after(ms, func)``-style timer function returning an id
+            cancel: ``after_cancel(id)``-style function
+            on_error: Called on the main thread when a write fails
+            delay_ms: Coalescing window for bursts of mutations
+        """
+        self.data_manager = data_manager
+        self.get_state = get_state
+        self.schedule = schedule
+        self.cancel = cancel
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+
+        self._timer = None
+        self._poll_timer = None
+        self._pending = 0
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name='autosave', daemon=True)
+        self._worker.start()
+
+    def mark_dirty(self):
+        """Request a save; restarts the coalescing window."""
+        if self._timer is not None:
+            self.cancel(self._timer)
+        self._timer = self.schedule(self.delay_ms, self._on_timer)
+
+    def append_changes(self, changes: List[Dict[str, Any]]):
+        """Queue mutation records for an incremental backend (see DataManager.append_changes)."""
+        self._enqueue(('changes', list(changes)))
+
+    @property
+    def dirty(self) -> bool:
+        return self._timer is not None
+
+    def flush(self):
+        """Write pending changes now and wait for the worker to finish."""
+        self._jobs.join()
+        self._collect_results()
+        # Queued records may have asked for a compaction snapshot
+        if self._timer is not None:
+            self.cancel(self._timer)
+            self._timer = None
+            self._submit()
+            self._jobs.join()
+            self._collect_results()
+
+    def close(self):
+        """Flush pending changes and stop the worker thread."""
+        self.flush()
+        if self._poll_timer is not None:
+            self.cancel(self._poll_timer)
+            self._poll_timer = None
+        self._jobs.put(None)
+        self._worker.join()
+        self.data_manager.close()
+
+    def _on_timer(self):
+        self._timer = None
+        self._submit()
+
+    def _submit(self):
+        state = self.get_state()
+        snapshot = self.data_manager.snapshot(state['global_tasks'], state['daily_ratings'],
+                                              state['workspaces'])
+        self._enqueue(('snapshot', snapshot))
+
+    def _enqueue(self, job):
+        self._pending += 1
+        self._jobs.put(job)
+        if self._poll_timer is None:
+            self._poll_timer = self.schedule(self.POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_timer = None
+        self._collect_results()
+        if self._pending > 0:
+            self._poll_timer = self.schedule(self.POLL_INTERVAL_MS, self._poll)
+
+    def _collect_results(self):
+        failed = False
+        compact = False
+        while True:
+            try:
+                success, needs_compaction = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            failed = failed or not success
+            compact = compact or needs_compaction
+        if compact:
+            self.mark_dirty()
+        if failed and self.on_error:
+            self.on_error()
 
+    def _run(self):
+        while True:
+            jobs = [self._jobs.get()]
+            while True:
+                try:
+                    jobs.append(self._jobs.get_nowait())
+                except queue.Empty:
+                    break
+            # Only the newest snapshot of a batch is written; records queued
+            # before it are still appended first, in order
+            last_snapshot = max((i for i, job in enumerate(jobs)
+                                 if job is not None and job[0] == 'snapshot'), default=-1)
+            for i, job in enumerate(jobs):
+                if job is None:
+                    for _ in jobs[i:]:
+                        self._jobs.task_done()
+                    return
+                kind, payload = job
+                if kind == 'changes':
+                    success = self.data_manager.append_changes(payload)
+                    result = (success, success and self.data_manager.needs_compaction())
+                elif i < last_snapshot:
+                    result = (True, False)  # superseded by a newer snapshot in this batch
+                else:
+                    result = (self.data_manager.write_snapshot(payload), False)
+                self._results.put(result)
+                self._jobs.task_done()
@@ -0,0 +1,96 @@
+"""Undo/redo history of mutation records."""
+
+import json
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from config import UNDO_BUDGET_BYTES
+
+Change = Dict[str, Any]
+
+
+class _Entry:
+    __slots__ = ('forward', 'inverse', 'size')
+
+    def __init__(self, forward: List[Change], inverse: List[Change]):
+        self.forward = forward
+        self.inverse = inverse
+        # Approximate footprint: the records' serialized length
+        self.size = len(json.dumps([forward, inverse], ensure_ascii=False))
+
+
+class UndoHistory:
+    """
+    Undo and redo stacks of (forward, inverse) mutation records.
+
+    Each user action is stored as the change records it applied and the
+    records that revert it (see storage.inverse_change), so undo and redo
+    cost O(size of the change) and go through the same apply and persist
+    path as the original action. The oldest entries are dropped once the
+    stacks together exceed ``budget_bytes``.
+    """
+
+    def __init__(self, budget_bytes: int = UNDO_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self._undo = deque()
+        self._redo = deque()
+        self._size = 0
+
+    @property
+    def memory_used(self) -> int:
+        """Approximate bytes held by both stacks."""
+        return self._size
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def record(self, forward: List[Change], inverse: List[Change]):
+        """
+        Add an applied action; clears the redo stack.
+
+        Args:
+            forward: Records the action applied, in order
+            inverse: Records that revert it, in order
+        """
+        self._discard(self._redo)
+        entry = _Entry(forward, inverse)
+        if entry.size > self.budget_bytes:
+            # Too large to keep; older entries would no longer apply cleanly
+            self.clear()
+            return
+        self._undo.append(entry)
+        self._size += entry.size
+        self._enforce_budget()
+
+    def undo(self) -> Optional[List[Change]]:
+        """Move the newest action to the redo stack and return its inverse records."""
+        if not self._undo:
+            return None
+        entry = self._undo.pop()
+        self._redo.append(entry)
+        return entry.inverse
+
+    def redo(self) -> Optional[List[Change]]:
+        """Move the newest undone action back and return its forward records."""
+        if not self._redo:
+            return None
+        entry = self._redo.pop()
+        self._undo.append(entry)
+        return entry.forward
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._size = 0
+
+    def _discard(self, stack: deque):
+        self._size -= sum(entry.size for entry in stack)
+        stack.clear()
+
+    def _enforce_budget(self):
+        """Drop the oldest undo entries until both stacks fit the budget."""
+        while self._size > self.budget_bytes and self._undo:
+            self._size -= self._undo.popleft().size
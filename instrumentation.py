@@ -0,0 +1,121 @@
+"""Opt-in latency histograms for hot paths (``main.py --instrument``)."""
+
+import json
+import math
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable
+
+
+class LatencyHistogram:
+    """
+    Log-scale latency histogram with fixed memory.
+
+    Buckets grow by 5% from 1 µs, so percentiles are reported as bucket
+    upper bounds with at most 5% relative error. Count, total, min and
+    max are exact.
+    """
+
+    BASE_MS = 0.001
+    GROWTH = 1.05
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+
+    def add(self, ms: float):
+        index = 0 if ms <= self.BASE_MS else math.ceil(math.log(ms / self.BASE_MS, self.GROWTH))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile (0 < p <= 100)."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.BASE_MS * self.GROWTH ** index, self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'total_ms': self.total_ms,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'min_ms': self.min_ms if self.count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': self.max_ms
+        }
+
+
+class Instrumentation:
+    """
+    Call counts and latency histograms per operation.
+
+    Methods are timed by replacing them on the instance with a wrapper
+    (see instrument()), so nothing is wrapped and there is no overhead
+    unless instrumentation is switched on. Samples may be recorded from
+    the loader and autosave threads as well as the Tk thread.
+    """
+
+    def __init__(self, output_file: str):
+        self.output_file = output_file
+        self.started = time.time()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, ms: float):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.add(ms)
+
+    def wrap(self, name: str, fn: Callable) -> Callable:
+        """Return fn timed under the given operation name."""
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(name, (time.perf_counter() - start) * 1000)
+        return timed
+
+    def instrument(self, obj, method_names: Iterable[str], prefix: str = ''):
+        """Time the named methods of one object (instance attributes shadow the class)."""
+        for method_name in method_names:
+            setattr(obj, method_name,
+                    self.wrap(prefix + method_name, getattr(obj, method_name)))
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            operations = {name: histogram.summary()
+                          for name, histogram in sorted(self._histograms.items())}
+        return {'started': self.started, 'dumped': time.time(), 'operations': operations}
+
+    def dump(self) -> bool:
+        """
+        Write the report as JSON to output_file.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with open(self.output_file, 'w', encoding='utf-8') as f:
+                json.dump(self.report(), f, ensure_ascii=False, indent=2)
+            return True
+        except OSError:
+            return False
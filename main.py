@@ -1,60 +1,125 @@
 """Modern Task Manager - Main application with CustomTkinter."""
 
+import time
+
+_PROCESS_START = time.perf_counter()  # Taken before the heavy imports below
+
+import argparse
+import threading
+import tkinter as tk
 import customtkinter as ctk
-from datetime import datetime, timedelta
-from config import WINDOW_SIZE, WINDOW_TITLE, DEFAULT_WORKSPACES
-from data_manager import DataManager
+from datetime import date, datetime, timedelta
+from config import (WINDOW_SIZE, WINDOW_TITLE, DEFAULT_WORKSPACES, VIRTUALIZED_TASK_LIST,
+                    LOAD_POLL_MS, INSTRUMENTATION_FILE, INSTRUMENTATION_KEY, PREFETCH_DELAY_MS)
+from data_manager import DataManager, SaveScheduler, MatrixDailyRatings, MatrixTaskDateIndex
+from history import UndoHistory
+from storage import inverse_change
+from aggregates import DailyAggregates, TaskDateIndex, WorkspaceIndex
+from instrumentation import Instrumentation
+from startup import StartupProfiler
 from ui.styles import StyleManager
 from ui.dialogs import DialogManager
-from ui.components import CalendarComponent
+from ui.colors import rating_color
+from ui.components import CalendarComponent, TaskListComponent, VirtualTaskList
+from ui.render_scheduler import RenderScheduler
+
+_IMPORTS_DONE = time.perf_counter()
 
 
 class ModernTaskManager:
     """Main application class for Modern Task Manager."""
     
-    def __init__(self, root):
+    INSTRUMENTED_METHODS = ('update_calendar', 'update_tasks_list', 'update_workspace_tiles',
+                            'update_big_metrics', 'show_day_tasks')
+    INSTRUMENTED_DATA_METHODS = ('load_data', 'save_data', 'write_snapshot', 'append_changes')
+    
+    def __init__(self, root, profiler: StartupProfiler = None, data_manager: DataManager = None,
+                 instrumentation: Instrumentation = None):
         self.root = root
+        self.profiler = profiler or StartupProfiler()
+        self.instrumentation = instrumentation
         self.root.title(WINDOW_TITLE)
         self.root.geometry(WINDOW_SIZE)
         
         # Initialize managers
-        self.data_manager = DataManager()
+        self.data_manager = data_manager or DataManager()
+        if instrumentation:
+            self._install_instrumentation()
         self.style_manager = StyleManager()
         self.dialog_manager = DialogManager(root, self.style_manager)
+        self.save_scheduler = SaveScheduler(
+            self.data_manager,
+            lambda: {'global_tasks': self.global_tasks,
+                     'daily_ratings': self.daily_ratings,
+                     'workspaces': self.workspaces},
+            self.root.after, self.root.after_cancel,
+            on_error=lambda: self.dialog_manager.show_error("Ошибка",
+                                                            "Не удалось сохранить данные"))
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Mutations mark regions dirty; each dirty region is redrawn once per idle pass
+        self.render_scheduler = RenderScheduler(
+            {'calendar': self.update_calendar,
+             'heatmap': self.update_heatmap,
+             'tasks': self.update_tasks_list,
+             'tiles': self.update_workspace_tiles,
+             'metrics': self._render_metrics,
+             'mini_graph': lambda: self.update_mini_graph(self._selected_day())},
+            self.root.after_idle, self.root.after_cancel)
         
         # Data storage
         self.global_tasks = {}
         self.daily_ratings = {}
         self.workspaces = []
         self.current_selected_date = None
-        
-        # Initialize data
-        self.load_data()
-        
-        # Setup UI
-        self.setup_ui()
-        
-        # Select today by default and update calendar
-        self.go_today()
-        self.calendar.update_calendar(self.show_day_tasks)
-        self.root.after(100, lambda: self.calendar.update_calendar(self.show_day_tasks))
+        self.daily_aggregates = DailyAggregates()
+        self.workspace_index = WorkspaceIndex()
+        self.task_dates = TaskDateIndex()
+        self.history = UndoHistory()
+        self._prefetch_job = None
+        
+        # Show the window shell right away; data is loaded and indexed on a
+        # background thread and the panels are built once it is ready
+        self.setup_shell()
+        self._loaded = None
+        self._load_error = None
+        self._load_progress = 0.0
+        self._loaded_event = threading.Event()
+        threading.Thread(target=self._load_in_background, name='loader', daemon=True).start()
+        self.root.after(LOAD_POLL_MS, self._finish_loading)
     
-    def setup_ui(self):
-        """Setup the main UI layout."""
+    def setup_shell(self):
+        """Setup the window shell: container, header and a loading placeholder."""
         # Main container with padding
-        main_container = ctk.CTkFrame(self.root)
-        main_container.pack(fill="both", expand=True, padx=20, pady=20)
+        self.main_container = ctk.CTkFrame(self.root)
+        self.main_container.pack(fill="both", expand=True, padx=20, pady=20)
         
         # Header
-        self.create_header(main_container)
+        self.create_header(self.main_container)
         
+        self.loading_label = ctk.CTkLabel(self.main_container, text="Загрузка...",
+                                          font=ctk.CTkFont(size=16))
+        self.loading_label.pack(expand=True)
+    
+    def setup_ui(self):
+        """Setup the main UI layout."""
         # Main content area
-        content_frame = ctk.CTkFrame(main_container)
+        content_frame = ctk.CTkFrame(self.main_container)
         content_frame.pack(fill="both", expand=True, pady=(10, 0))
         
         # Left and Right panels
         self.create_left_panel(content_frame)
         self.create_right_panel(content_frame)
+        
+        # Undo / redo on the window; text fields keep their own Ctrl+Z
+        self.root.bind("<Control-z>", lambda e: self._on_history_key(e, self.undo))
+        self.root.bind("<Control-y>", lambda e: self._on_history_key(e, self.redo))
+        self.root.bind("<Control-Z>", lambda e: self._on_history_key(e, self.redo))
+    
+    def _on_history_key(self, event, action):
+        """Run undo/redo for a shortcut unless it was typed into a text field."""
+        if isinstance(event.widget, (tk.Entry, tk.Text)):
+            return
+        action()
     
     def create_header(self, parent):
         """Create header with title and date."""
@@ -99,19 +164,25 @@ class ModernTaskManager:
         self.calendar_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
         # Calendar canvas for custom drawing
-        import tkinter as tk
         self.calendar_canvas = tk.Canvas(self.calendar_frame, bg="#1a1a2e",
                                         highlightthickness=0, borderwidth=0)
         self.calendar_canvas.pack(fill="both", expand=True)
         
         # Initialize calendar component
-        self.calendar = CalendarComponent(self.style_manager, self.get_daily_rating)
-        self.calendar.canvas = self.calendar_canvas
+        self.calendar = CalendarComponent(self.style_manager, self.get_daily_rating,
+                                          lambda: self.daily_aggregates.version)
+        self.calendar.attach_canvas(self.calendar_canvas)
         self.calendar.current_date = datetime.now()
         
+        # Year heatmap under the month view; built on first render, since it
+        # needs Pillow (see _ensure_heatmap)
+        self.heatmap = None
+        self._heatmap_available = True
+        
         # Big metrics under calendar: day, week, total
         metrics_frame = ctk.CTkFrame(left_panel, fg_color="transparent")
         metrics_frame.pack(fill="x", padx=10, pady=(0, 10))
+        self._heatmap_place = (left_panel, metrics_frame)
         
         self.metric_day = ctk.CTkLabel(metrics_frame, text="0.0",
                                        font=ctk.CTkFont(size=36, weight="bold"),
@@ -128,6 +199,18 @@ class ModernTaskManager:
                                          width=120)
         self.metric_total.pack(side="left", expand=True)
         
+        # Period averages: month, quarter, year of the selected day
+        periods_frame = ctk.CTkFrame(left_panel, fg_color="transparent")
+        periods_frame.pack(fill="x", padx=10, pady=(0, 10))
+        
+        self.metric_periods = {}
+        for key in ("month", "quarter", "year"):
+            label = ctk.CTkLabel(periods_frame, text="",
+                                 font=ctk.CTkFont(size=13),
+                                 width=120)
+            label.pack(side="left", expand=True)
+            self.metric_periods[key] = label
+        
         # Daily stats card
         stats_card = ctk.CTkFrame(left_panel)
         stats_card.pack(fill="x", padx=10, pady=(0, 10))
@@ -207,10 +290,19 @@ class ModernTaskManager:
         tiles_container = ctk.CTkFrame(tasks_card, fg_color="transparent")
         tiles_container.pack(fill="x", padx=15, pady=(0, 8))
         self.workspace_tiles_container = tiles_container
-        self.update_workspace_tiles()
-        
-        # Tasks scrollable frame
-        self.tasks_frame = ctk.CTkScrollableFrame(tasks_card)
+        self.render_scheduler.mark_dirty('tiles')
+        
+        # Tasks list: windowed, or a scrollable frame holding every row
+        if VIRTUALIZED_TASK_LIST:
+            self.task_list = VirtualTaskList(tasks_card, self.show_rating_dialog,
+                                             self.edit_task_description,
+                                             self.delete_global_task)
+            self.tasks_frame = self.task_list.frame
+        else:
+            self.tasks_frame = ctk.CTkScrollableFrame(tasks_card)
+            self.task_list = TaskListComponent(self.tasks_frame, self.show_rating_dialog,
+                                               self.edit_task_description,
+                                               self.delete_global_task)
         self.tasks_frame.pack(fill="both", expand=True, padx=15, pady=(0, 15))
         
         # Bind Enter key
@@ -223,69 +315,107 @@ class ModernTaskManager:
     def previous_month(self):
         """Navigate to previous month."""
         self.calendar.previous_month()
-        self.update_calendar()
+        self.render_scheduler.mark_dirty('calendar')
     
     def next_month(self):
         """Navigate to next month."""
         self.calendar.next_month()
-        self.update_calendar()
+        self.render_scheduler.mark_dirty('calendar')
     
     def go_today(self):
         """Navigate to today's date."""
         self.calendar.go_today()
-        self.update_calendar()
+        self.render_scheduler.mark_dirty('calendar', 'heatmap')
         today_str = datetime.now().strftime("%Y-%m-%d")
         self.show_day_tasks(today_str)
     
     def update_calendar(self):
         """Update calendar display."""
+        shown = self.calendar.current_date
+        self._ensure_months_loaded(date(shown.year, shown.month, 1), date(shown.year, shown.month, 1))
         self.calendar.update_calendar(self.show_day_tasks)
         self.month_label.configure(text=self.calendar.get_month_label_text())
-        self.date_label.configure(text=f"Сегодня: {datetime.now().strftime('%d.%m.%Y')}")
         
-        # Schedule another update if canvas not rendered yet
-        if self.calendar_canvas.winfo_width() <= 1:
-            self.root.after(100, self.update_calendar)
-        else:
-            # Update metrics for current day
-            self.update_big_metrics(datetime.now().strftime("%Y-%m-%d"))
+        # Prepare the neighbouring months once the UI is idle
+        if self._prefetch_job is not None:
+            self.root.after_cancel(self._prefetch_job)
+        self._prefetch_job = self.root.after(PREFETCH_DELAY_MS, self._prefetch_adjacent_months)
+    
+    def _prefetch_adjacent_months(self):
+        """Load and precompute the months before and after the shown one."""
+        self._prefetch_job = None
+        months = self.calendar.adjacent_months()
+        for year, month in months:
+            self._ensure_months_loaded(date(year, month, 1), date(year, month, 1))
+        self.calendar.prefetch(months)
+    
+    def update_heatmap(self):
+        """Update the year heatmap; only days whose rating changed are repainted."""
+        if not self._ensure_heatmap():
+            return
+        today = date.today()
+        self._ensure_months_loaded(today - timedelta(days=self.heatmap.DAYS - 1), today)
+        self.heatmap.render(today)
+    
+    def _ensure_heatmap(self) -> bool:
+        """
+        Build the year heatmap the first time it is shown.
+        
+        Returns:
+            False if Pillow is not installed; the heatmap is then left out
+        """
+        if self.heatmap is None and self._heatmap_available:
+            try:
+                from ui.heatmap import YearHeatmap
+            except ImportError:
+                self._heatmap_available = False
+                return False
+            parent, metrics_frame = self._heatmap_place
+            self.heatmap = YearHeatmap(parent, lambda day: self.daily_aggregates.average_on(day),
+                                       self._on_heatmap_click)
+            # Between the calendar and the metrics, as if packed in create_left_panel
+            self.heatmap.frame.pack(fill="x", padx=10, pady=(0, 10), before=metrics_frame)
+        return self.heatmap is not None
+    
+    def _on_heatmap_click(self, date_str: str):
+        """Show the clicked day's month in the calendar and select the day."""
+        self.calendar.current_date = datetime.strptime(date_str, "%Y-%m-%d")
+        self.render_scheduler.mark_dirty('calendar')
+        self.show_day_tasks(date_str)
     
     def get_daily_rating(self, date_str: str) -> float:
-        """Calculate average daily rating."""
-        if date_str in self.daily_ratings:
-            ratings = [rating for rating in self.daily_ratings[date_str].values() if rating > 0]
-            if ratings:
-                return sum(ratings) / len(ratings)
-        return 0.0
+        """Return average daily rating from the aggregate cache."""
+        return self.daily_aggregates.average(date_str)
     
     def show_day_tasks(self, date_str: str):
         """Display tasks for selected day."""
         self.current_selected_date = date_str
-        self.update_tasks_list()
+        self.render_scheduler.mark_dirty('tasks', 'tiles', 'metrics', 'mini_graph')
+    
+    def _selected_day(self) -> str:
+        """Selected day, or today if none is selected."""
+        return self.current_selected_date or datetime.now().strftime("%Y-%m-%d")
+    
+    def _render_metrics(self):
+        """Redraw big metrics, the daily rating and the date label for the selected day."""
+        date_str = self._selected_day()
+        self.update_big_metrics(date_str)
         
         rating = self.get_daily_rating(date_str)
         self.daily_rating.configure(text=f"{rating:.1f} / 5.0")
         
-        # Update mini graph showing last 7 days
-        self.update_mini_graph(date_str)
-        # Update big metrics
-        self.update_big_metrics(date_str)
-        
-        # Update date display
-        selected_date = datetime.strptime(date_str, "%Y-%m-%d")
-        self.date_label.configure(text=f"Выбрано: {selected_date.strftime('%d.%m.%Y')}")
+        if self.current_selected_date:
+            selected_date = datetime.strptime(date_str, "%Y-%m-%d")
+            self.date_label.configure(text=f"Выбрано: {selected_date.strftime('%d.%m.%Y')}")
+        else:
+            self.date_label.configure(text=f"Сегодня: {datetime.now().strftime('%d.%m.%Y')}")
     
     def update_mini_graph(self, date_str: str):
         """Update mini graph showing last 7 days trend."""
         # Get last 7 days ratings
-        last_7_ratings = []
-        selected_date = datetime.strptime(date_str, "%Y-%m-%d")
-        
-        for i in range(6, -1, -1):  # 6 days ago to today
-            day = selected_date - timedelta(days=i)
-            day_str = day.strftime("%Y-%m-%d")
-            rating = self.get_daily_rating(day_str)
-            last_7_ratings.append(rating)
+        selected_date = date.fromisoformat(date_str)
+        last_7_ratings = [self.daily_aggregates.average_on(selected_date - timedelta(days=i))
+                          for i in range(6, -1, -1)]  # 6 days ago to today
         
         # Create visual graph with characters
         # Use: ▁▂▃▄▅▆▇█ for different heights based on rating
@@ -302,56 +432,70 @@ class ModernTaskManager:
         graph_text = ''.join(bars)
         self.mini_graph.configure(text=graph_text)
 
-    def _rating_color(self, value: float) -> str:
-        """Map rating value to color consistent with UI labels."""
-        if value <= 0:
-            return "#888888"
-        if value <= 2:
-            return "#ff4444"  # Red
-        if value <= 3:
-            return "#ffaa00"  # Orange
-        if value <= 4:
-            return "#ffaa00"  # Yellow
-        return "#00ff88"  # Green
-
     def update_big_metrics(self, date_str: str):
         """Update three big numbers: day, week, total with colors."""
         # Day
         day_val = self.get_daily_rating(date_str)
-        self.metric_day.configure(text=f"{day_val:.1f}", text_color=self._rating_color(day_val))
+        self.metric_day.configure(text=f"{day_val:.1f}", text_color=rating_color(day_val))
         
         # Week (last 7 days including selected), average over days with rating > 0
-        selected_date = datetime.strptime(date_str, "%Y-%m-%d")
-        week_vals = []
-        for i in range(6, -1, -1):
-            d = selected_date - timedelta(days=i)
-            v = self.get_daily_rating(d.strftime("%Y-%m-%d"))
-            if v > 0:
-                week_vals.append(v)
-        week_avg = sum(week_vals) / len(week_vals) if week_vals else 0.0
-        self.metric_week.configure(text=f"{week_avg:.1f}", text_color=self._rating_color(week_avg))
-        
-        # Total (over all dates)
-        all_vals = []
-        for dstr in self.daily_ratings.keys():
-            v = self.get_daily_rating(dstr)
-            if v > 0:
-                all_vals.append(v)
-        total_avg = sum(all_vals) / len(all_vals) if all_vals else 0.0
-        self.metric_total.configure(text=f"{total_avg:.1f}", text_color=self._rating_color(total_avg))
+        selected_date = date.fromisoformat(date_str)
+        self._ensure_months_loaded(selected_date - timedelta(days=6), selected_date)
+        week_avg = self.daily_aggregates.range_average(selected_date - timedelta(days=6),
+                                                       selected_date)
+        self.metric_week.configure(text=f"{week_avg:.1f}", text_color=rating_color(week_avg))
+        
+        # Total (over all rated dates)
+        total_avg = self.daily_aggregates.overall_average()
+        self.metric_total.configure(text=f"{total_avg:.1f}", text_color=rating_color(total_avg))
+        
+        self.update_period_metrics(selected_date)
+    
+    def update_period_metrics(self, selected_date: date):
+        """
+        Update month, quarter and year averages for the selected day.
+
+        Periods are whole months, so months a lazy backend has not loaded
+        are counted through their stored summaries instead of being loaded.
+        """
+        year = selected_date.year
+        quarter_month = (selected_date.month - 1) // 3 * 3 + 1
+        periods = {
+            "month": ("Месяц", selected_date.replace(day=1),
+                      self._month_end(year, selected_date.month)),
+            "quarter": ("Квартал", date(year, quarter_month, 1),
+                        self._month_end(year, quarter_month + 2)),
+            "year": ("Год", date(year, 1, 1), date(year, 12, 31)),
+        }
+        for key, (title, start, end) in periods.items():
+            total, days = self.daily_aggregates.range_totals(start, end)
+            unloaded_total, unloaded_days = self.data_manager.unloaded_totals(
+                (start.year, start.month), (end.year, end.month))
+            days += unloaded_days
+            value = (total + unloaded_total) / days if days else 0.0
+            self.metric_periods[key].configure(text=f"{title}: {value:.1f}",
+                                               text_color=rating_color(value))
+    
+    @staticmethod
+    def _month_end(year: int, month: int) -> date:
+        """Last day of a month."""
+        if month == 12:
+            return date(year, 12, 31)
+        return date(year, month + 1, 1) - timedelta(days=1)
     
     def update_tasks_list(self):
-        """Update the tasks list display."""
-        # Clear existing tasks
-        for widget in self.tasks_frame.winfo_children():
-            widget.destroy()
+        """Update the tasks list display, reusing pooled rows."""
+        items = []
         
-        # Add tasks filtered by selected workspace
+        # Tasks filtered by selected workspace
         if self.current_selected_date:
             current_ws = self.workspace_var.get()
-            for task_id, task in self.global_tasks.items():
-                if task.get('workspace') == current_ws:
-                    self.create_task_widget(task_id, task)
+            day_ratings = self.daily_ratings.get(self.current_selected_date, {})
+            for task_id in self.workspace_index.tasks(current_ws):
+                items.append((task_id, self.global_tasks[task_id]['description'],
+                              day_ratings.get(task_id, 0)))
+        
+        self.task_list.render(items)
 
     def update_workspace_tiles(self):
         """Render workspace tiles with per-day rating and selection."""
@@ -365,14 +509,8 @@ class ModernTaskManager:
         day = self.current_selected_date or datetime.now().strftime("%Y-%m-%d")
         
         for ws in self.workspaces:
-            vals = []
-            if day in self.daily_ratings:
-                for task_id, rating in self.daily_ratings[day].items():
-                    task = self.global_tasks.get(task_id)
-                    if task and task.get('workspace') == ws and rating > 0:
-                        vals.append(rating)
-            ws_avg = sum(vals)/len(vals) if vals else 0.0
-            color = self._rating_color(ws_avg)
+            ws_avg = self.workspace_index.day_average(day, ws)
+            color = rating_color(ws_avg)
             
             btn = ctk.CTkButton(self.workspace_tiles_container,
                                  text=f"{ws}\n{ws_avg:.1f}",
@@ -385,77 +523,7 @@ class ModernTaskManager:
 
     def _on_workspace_tile_click(self, name: str):
         self.workspace_var.set(name)
-        self.update_workspace_tiles()
-        self.update_tasks_list()
-    
-    def create_task_widget(self, task_id: str, task: dict):
-        """Create a compact task tile."""
-        task_frame = ctk.CTkFrame(self.tasks_frame)
-        task_frame.pack(fill="x", pady=3)
-        
-        # Main content in one line
-        content_frame = ctk.CTkFrame(task_frame, fg_color="transparent")
-        content_frame.pack(fill="x", padx=8, pady=6)
-        
-        # Task text (compact)
-        task_text = task['description']
-        task_label = ctk.CTkLabel(content_frame, text=task_text,
-                                font=ctk.CTkFont(family="Segoe UI", size=13, weight="bold"),
-                                text_color="#00d4ff")
-        task_label.pack(side="left", padx=(0, 8))
-        
-        # Rating display with color based on value (compact)
-        current_rating = 0
-        if (self.current_selected_date and 
-            self.current_selected_date in self.daily_ratings and 
-            task_id in self.daily_ratings[self.current_selected_date]):
-            current_rating = self.daily_ratings[self.current_selected_date][task_id]
-        
-        if current_rating > 0:
-            # Color based on rating: red for low, green for high
-            if current_rating <= 2:
-                rating_color = "#ff4444"
-            elif current_rating <= 3:
-                rating_color = "#ffaa00"
-            elif current_rating <= 4:
-                rating_color = "#ffaa00"
-            else:
-                rating_color = "#00ff88"
-            rating_text = f"{current_rating}/5"
-        else:
-            rating_color = "#666666"
-            rating_text = "?"
-            
-        rating_label = ctk.CTkLabel(content_frame, text=rating_text,
-                                   font=ctk.CTkFont(size=12, weight="bold"),
-                                   text_color=rating_color,
-                                   width=40)
-        rating_label.pack(side="right")
-        
-        # Edit button (small)
-        edit_btn = ctk.CTkButton(content_frame, text="✎",
-                                font=ctk.CTkFont(size=10),
-                                width=24, height=24,
-                                fg_color="#2a2a2a",
-                                hover_color="#3a3a3a",
-                                command=lambda: self.edit_task_description(task_id))
-        edit_btn.pack(side="right", padx=(0, 8))
-        
-        # Delete button (small)
-        delete_btn = ctk.CTkButton(content_frame, text="✕",
-                                   font=ctk.CTkFont(size=11, weight="bold"),
-                                   width=24, height=24,
-                                   fg_color="#e94560",
-                                   hover_color="#d63031",
-                                   command=lambda: self.delete_global_task(task_id))
-        delete_btn.pack(side="right", padx=(0, 8))
-        
-        # Bind click events for rating
-        def make_click_handler(tid):
-            return lambda e: self.show_rating_dialog(tid)
-        
-        for widget in [task_frame, content_frame, task_label, rating_label]:
-            widget.bind("<Button-1>", make_click_handler(task_id))
+        self.render_scheduler.mark_dirty('tiles', 'tasks')
     
     def edit_task_description(self, task_id: str):
         """Edit task description and criteria."""
@@ -490,10 +558,9 @@ class ModernTaskManager:
             new_criteria = criteria_entry.get("1.0", "end-1c").strip()
             
             if new_name:
-                self.global_tasks[task_id]['description'] = new_name
-                self.global_tasks[task_id]['description_criteria'] = new_criteria
-                self.update_tasks_list()
-                self.save_data()
+                self.commit_changes({'op': 'task', 'task_id': task_id,
+                                     'task': dict(task, description=new_name,
+                                                  description_criteria=new_criteria)})
                 dialog.destroy()
         
         button_frame = ctk.CTkFrame(dialog, fg_color="transparent")
@@ -523,32 +590,18 @@ class ModernTaskManager:
         rating = self.dialog_manager.show_rating_dialog(task['description'])
         
         if rating > 0:
-            # Initialize date if not exists
-            if self.current_selected_date not in self.daily_ratings:
-                self.daily_ratings[self.current_selected_date] = {}
-            
             # Set rating for this task on current date
-            self.daily_ratings[self.current_selected_date][task_id] = rating
-            
-            self.update_tasks_list()
-            self.update_calendar()
-            
-            # Update daily rating
-            daily_rating = self.get_daily_rating(self.current_selected_date)
-            self.daily_rating.configure(text=f"{daily_rating:.1f} / 5.0")
-            
-            self.save_data()
+            self.commit_changes({'op': 'rating', 'date': self.current_selected_date,
+                                 'task_id': task_id, 'rating': rating})
     
     def create_workspace(self):
         """Create new workspace."""
         workspace_name = self.dialog_manager.show_workspace_dialog()
         if workspace_name:
             if workspace_name not in self.workspaces:
-                self.workspaces.append(workspace_name)
-                self.update_workspace_combo()
+                self.commit_changes({'op': 'workspaces',
+                                     'workspaces': self.workspaces + [workspace_name]})
                 self.workspace_var.set(workspace_name)
-                self.update_workspace_tiles()
-                self.save_data()
             else:
                 self.dialog_manager.show_warning(
                     "Предупреждение",
@@ -572,20 +625,16 @@ class ModernTaskManager:
         if self.dialog_manager.ask_confirmation("Подтверждение",
                                               f"Удалить рабочее пространство '{workspace_name}'?\nВсе задачи этого пространства будут сохранены."):
             # Remove workspace
-            self.workspaces.remove(workspace_name)
+            changes = [{'op': 'workspaces',
+                        'workspaces': [ws for ws in self.workspaces if ws != workspace_name]}]
             
             # Remove workspace from tasks (keep tasks, just remove workspace reference)
-            for task_id in self.global_tasks:
-                if self.global_tasks[task_id]['workspace'] == workspace_name:
-                    # Move to default workspace
-                    self.global_tasks[task_id]['workspace'] = "Без категории"
-            
-            self.update_workspace_combo()
-            # Reset selection
-            if self.workspaces:
-                self.workspace_var.set(self.workspaces[0])
-            self.update_workspace_tiles()
-            self.save_data()
+            for task_id in self.workspace_index.tasks(workspace_name):
+                # Move to default workspace
+                changes.append({'op': 'task', 'task_id': task_id,
+                                'task': dict(self.global_tasks[task_id],
+                                             workspace="Без категории")})
+            self.commit_changes(*changes)
     
     def update_workspace_combo(self):
         """Update workspace combobox values."""
@@ -596,8 +645,7 @@ class ModernTaskManager:
         if self.workspaces and not self.workspace_var.get():
             self.workspace_var.set(self.workspaces[0])
         # Also refresh tiles
-        if hasattr(self, 'workspace_tiles_container'):
-            self.update_workspace_tiles()
+        self.render_scheduler.mark_dirty('tiles')
     
     def add_global_task(self):
         """Add a global task that appears every day."""
@@ -617,58 +665,274 @@ class ModernTaskManager:
         task_id = f"task_{len(self.global_tasks)}_{datetime.now().timestamp()}"
         
         # Add to global tasks
-        self.global_tasks[task_id] = {
+        self.commit_changes({'op': 'task', 'task_id': task_id, 'task': {
             'description': task_text,
             'workspace': workspace,
             'description_criteria': ''  # For future criteria
-        }
-        
+        }})
         self.task_entry.delete(0, "end")
-        self.update_tasks_list()
-        self.update_workspace_tiles()
-        self.save_data()
     
     def delete_global_task(self, task_id: str):
         """Delete global task from everywhere."""
         if self.dialog_manager.ask_confirmation("Подтверждение",
                                                "Удалить эту задачу из всех дней?"):
-            # Remove from global tasks
-            if task_id in self.global_tasks:
-                del self.global_tasks[task_id]
-            
-            # Remove from all daily ratings
-            for date in self.daily_ratings:
-                if task_id in self.daily_ratings[date]:
-                    del self.daily_ratings[date][task_id]
-            
-            self.update_tasks_list()
-            self.update_calendar()
-            self.update_workspace_tiles()
-            
-            # Update daily rating
-            if self.current_selected_date:
-                rating = self.get_daily_rating(self.current_selected_date)
-                self.daily_rating.configure(text=f"{rating:.1f} / 5.0")
-            
-            self.save_data()
+            # Remove from all daily ratings the task was rated on (as separate
+            # records, so undo restores them), then from global tasks
+            for year, month in self.data_manager.unloaded_months():
+                self._load_month(year, month)
+            changes = [{'op': 'rating', 'date': date_str, 'task_id': task_id, 'rating': 0}
+                       for date_str in self.task_dates.dates(task_id)]
+            changes.append({'op': 'task_delete', 'task_id': task_id})
+            self.commit_changes(*changes)
+    
+    def commit_changes(self, *changes):
+        """
+        Apply a user action given as mutation records, record it for undo and persist it.
+
+        The inverse of each record is computed against the state just before
+        it is applied, so the inverse list undoes the action when applied in order.
+        """
+        inverse = []
+        for change in changes:
+            state = {'global_tasks': self.global_tasks, 'daily_ratings': self.daily_ratings,
+                     'workspaces': self.workspaces}
+            inverse[:0] = inverse_change(state, change)
+            self._apply_changes([change])
+        self.history.record(list(changes), inverse)
+        self.save_data(*changes)
+    
+    def undo(self):
+        """Revert the last action."""
+        changes = self.history.undo()
+        if changes:
+            self._apply_changes(changes)
+            self.save_data(*changes)
+    
+    def redo(self):
+        """Reapply the last undone action."""
+        changes = self.history.redo()
+        if changes:
+            self._apply_changes(changes)
+            self.save_data(*changes)
+    
+    def _apply_changes(self, changes):
+        """Apply mutation records to the data and indexes and mark affected regions dirty."""
+        workspaces_changed = False
+        dirty = set()
+        for change in changes:
+            op = change['op']
+            if op == 'rating':
+                self._set_rating(change['date'], change['task_id'], change['rating'])
+                dirty.update(self._rating_regions(change['date']))
+            elif op == 'task':
+                task_id = change['task_id']
+                task = dict(change['task'])
+                old = self.global_tasks.get(task_id)
+                self.global_tasks[task_id] = task
+                if old is None:
+                    self.workspace_index.add_task(task_id, task.get('workspace'))
+                elif old.get('workspace') != task.get('workspace'):
+                    self.workspace_index.move_task(task_id, task.get('workspace'),
+                                                   self.get_task_history(task_id).items())
+                    # Its ratings now count towards another workspace's tile
+                    dirty.add('tiles')
+                dirty.add('tasks')
+            elif op == 'task_delete':
+                task_id = change['task_id']
+                for date_str in self.task_dates.dates(task_id):
+                    self._set_rating(date_str, task_id, 0)
+                    dirty.update(self._rating_regions(date_str))
+                if isinstance(self.daily_ratings, MatrixDailyRatings):
+                    # The column is empty now; free it for the next new task
+                    self.daily_ratings.matrix.remove_task(task_id)
+                self.global_tasks.pop(task_id, None)
+                self.workspace_index.remove_task(task_id)
+                dirty.add('tasks')
+            elif op == 'workspaces':
+                self.workspaces = list(change['workspaces'])
+                workspaces_changed = True
+                dirty.update(('tiles', 'tasks'))
+        if workspaces_changed:
+            self.update_workspace_combo()
+            if self.workspace_var.get() not in self.workspaces:
+                self.workspace_var.set(self.workspaces[0] if self.workspaces else "")
+        if dirty:
+            self.render_scheduler.mark_dirty(*dirty)
+    
+    def _rating_regions(self, date_str: str) -> set:
+        """Render regions showing a rating of the given day."""
+        regions = {'calendar', 'heatmap', 'metrics', 'tasks'}
+        selected = date.fromisoformat(self._selected_day())
+        days_back = (selected - date.fromisoformat(date_str)).days
+        if days_back == 0:
+            # Tiles show per-workspace averages of the selected day
+            regions.add('tiles')
+        if 0 <= days_back < 7:
+            regions.add('mini_graph')
+        return regions
+    
+    def get_task_history(self, task_id: str) -> dict:
+        """Return all ratings of a task as date -> rating."""
+        return self.task_dates.history(task_id, self.daily_ratings)
     
-    def load_data(self):
-        """Load data from JSON file."""
-        data = self.data_manager.load_data()
+    def _set_rating(self, date_str: str, task_id: str, rating: int):
+        """Set (or clear with 0) a task rating and keep aggregates in sync."""
+        day_ratings = self.daily_ratings.setdefault(date_str, {})
+        old = day_ratings.get(task_id, 0)
+        if rating > 0:
+            day_ratings[task_id] = rating
+        else:
+            day_ratings.pop(task_id, None)
+        self.daily_aggregates.update(date_str, old, rating)
+        self.workspace_index.update_rating(date_str, task_id, old, rating)
+        self.task_dates.update(date_str, task_id, rating)
+    
+    def _load_in_background(self):
+        """Load data and build indexes on the loader thread."""
+        try:
+            # Daily aggregates are built day by day while the file is parsed
+            daily_aggregates = DailyAggregates()
+            with self.profiler.phase("load"):
+                data = self.data_manager.load_data(on_progress=self._set_load_progress,
+                                                   on_day=daily_aggregates.set_day)
+            with self.profiler.phase("index build"):
+                indexes = self._build_indexes(data, daily_aggregates)
+            self._loaded = (data, indexes)
+        except Exception as e:
+            # Reported on the main thread by _finish_loading
+            self._load_error = e
+        finally:
+            self._loaded_event.set()
+    
+    def _finish_loading(self):
+        """Install loaded data and build the panels once the loader is done."""
+        if not self._loaded_event.is_set():
+            if self._load_progress > 0:
+                self.loading_label.configure(text=f"Загрузка... {int(self._load_progress * 100)}%")
+            self.root.after(LOAD_POLL_MS, self._finish_loading)
+            return
+        if self._load_error is not None:
+            # Nothing was loaded, so close without building the panels; a
+            # snapshot of the empty state must not overwrite the data file
+            self.loading_label.configure(text="Ошибка загрузки")
+            self.dialog_manager.show_error("Ошибка",
+                                           f"Не удалось загрузить данные: {self._load_error}")
+            self.on_close()
+            return
+        data, indexes = self._loaded
+        self._loaded = None
+        self._apply_data(data, indexes)
+        
+        with self.profiler.phase("ui build"):
+            self.loading_label.destroy()
+            self.setup_ui()
+            # Select today by default; the calendar redraws itself on <Configure>
+            self.go_today()
+            self.root.update_idletasks()
+        if self.profiler.enabled:
+            print(self.profiler.report())
+        if not self.data_manager.load_complete:
+            self.dialog_manager.show_warning(
+                "Внимание",
+                "Файл данных повреждён. Загружены записи до первой ошибки, "
+                "копия исходного файла сохранена с расширением .corrupt")
+    
+    def _set_load_progress(self, fraction: float):
+        """Record load progress from the loader thread; polled by _finish_loading."""
+        self._load_progress = fraction
+    
+    def _build_indexes(self, data: dict, daily_aggregates: DailyAggregates = None):
+        """Build aggregate and secondary indexes for loaded data."""
+        if daily_aggregates is None:
+            daily_aggregates = DailyAggregates()
+            daily_aggregates.rebuild(data['daily_ratings'])
+        daily_aggregates.add_external(*self.data_manager.unloaded_totals())
+        workspace_index = WorkspaceIndex()
+        workspace_index.rebuild(data['global_tasks'], data['daily_ratings'])
+        if isinstance(data['daily_ratings'], MatrixDailyRatings):
+            # The matrix answers "which days is this task rated on" itself
+            task_dates = MatrixTaskDateIndex(data['daily_ratings'].matrix)
+        else:
+            task_dates = TaskDateIndex()
+            task_dates.rebuild(data['daily_ratings'])
+        return daily_aggregates, workspace_index, task_dates
+    
+    def _ensure_months_loaded(self, start: date, end: date):
+        """Load every month overlapping [start, end] that a lazy backend has not loaded."""
+        if not self.data_manager.lazy:
+            return
+        year, month = start.year, start.month
+        while (year, month) <= (end.year, end.month):
+            if not self.data_manager.is_month_loaded(year, month):
+                self._load_month(year, month)
+            year, month = (year, month + 1) if month < 12 else (year + 1, 1)
+    
+    def _load_month(self, year: int, month: int):
+        """Merge one lazily loaded month into daily_ratings and the indexes."""
+        ratings, (total, days) = self.data_manager.load_month(year, month)
+        # The month's stored summary leaves the external total; its ratings
+        # are added back day by day through the regular index updates
+        self.daily_aggregates.add_external(-total, -days)
+        for date_str, day_ratings in ratings.items():
+            for task_id, rating in day_ratings.items():
+                self._set_rating(date_str, task_id, rating)
+    
+    def _apply_data(self, data: dict, indexes):
+        """Install loaded data and its indexes."""
         self.global_tasks = data['global_tasks']
         self.daily_ratings = data['daily_ratings']
         self.workspaces = data['workspaces']
+        self.daily_aggregates, self.workspace_index, self.task_dates = indexes
     
-    def save_data(self):
-        """Save data to JSON file."""
-        success = self.data_manager.save_data(self.global_tasks, self.daily_ratings,
-                                             self.workspaces)
-        if not success:
-            self.dialog_manager.show_error("Ошибка", "Не удалось сохранить данные")
+    def save_data(self, *changes):
+        """
+        Persist data.
 
+        With an incremental backend the given change records are persisted
+        (journal append or SQLite upserts), and the full snapshot is only
+        rewritten once the backend needs compaction. Both run in order on the
+        autosave thread; snapshot writes are coalesced.
+        """
+        if self.data_manager.incremental and changes:
+            self.save_scheduler.append_changes(changes)
+        else:
+            self.save_scheduler.mark_dirty()
+    
+    def _install_instrumentation(self):
+        """Time hot paths and dump the report on the instrumentation key and on exit."""
+        self.instrumentation.instrument(self, self.INSTRUMENTED_METHODS)
+        self.instrumentation.instrument(self.data_manager, self.INSTRUMENTED_DATA_METHODS,
+                                        prefix='DataManager.')
+        self.root.bind_all(INSTRUMENTATION_KEY, lambda e: self.instrumentation.dump())
+    
+    def on_close(self):
+        """Flush pending saves and close the window."""
+        self.save_scheduler.close()
+        if self.instrumentation:
+            self.instrumentation.dump()
+        self.root.destroy()
 
-if __name__ == "__main__":
-    root = ctk.CTk()
-    app = ModernTaskManager(root)
+
+def main():
+    parser = argparse.ArgumentParser(description=WINDOW_TITLE)
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="print a phase-by-phase startup timing breakdown")
+    parser.add_argument('--instrument', action='store_true',
+                        help=f"record hot-path latencies into {INSTRUMENTATION_FILE} "
+                             f"(on exit and on {INSTRUMENTATION_KEY})")
+    args = parser.parse_args()
+    instrumentation = Instrumentation(INSTRUMENTATION_FILE) if args.instrument else None
+    
+    profiler = StartupProfiler(enabled=args.profile_startup, origin=_PROCESS_START)
+    profiler.record("imports", _PROCESS_START, _IMPORTS_DONE)
+    with profiler.phase("window shell"):
+        root = ctk.CTk()
+        app = ModernTaskManager(root, profiler, instrumentation=instrumentation)
+        root.update_idletasks()
+    profiler.mark("first paint")
     root.mainloop()
 
+
+if __name__ == "__main__":
+    main()
+
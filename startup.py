@@ -0,0 +1,57 @@
+"""Startup phase timing for ``main.py --profile-startup``."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+
+class StartupProfiler:
+    """
+    Records named startup phases relative to process start.
+
+    Phases may be recorded from the loader thread as well as the Tk thread.
+    When disabled, phase() and mark() do nothing but yield/return.
+    """
+
+    def __init__(self, enabled: bool = False, origin: Optional[float] = None):
+        self.enabled = enabled
+        self.origin = origin if origin is not None else time.perf_counter()
+        self._phases: List[Tuple[str, float, float]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block as one phase."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter())
+
+    def record(self, name: str, start: float, end: float):
+        """Record a phase with explicit perf_counter() bounds."""
+        if self.enabled:
+            with self._lock:
+                self._phases.append((name, start, end))
+
+    def mark(self, name: str):
+        """Record a point in time (a zero-length phase), e.g. first paint."""
+        now = time.perf_counter()
+        self.record(name, now, now)
+
+    def report(self) -> str:
+        """Phase table ordered by start time, in milliseconds since process start."""
+        with self._lock:
+            phases = sorted(self._phases, key=lambda p: p[1])
+        lines = [f"{'phase':<16}{'start ms':>10}{'duration ms':>14}"]
+        for name, start, end in phases:
+            lines.append(f"{name:<16}{(start - self.origin) * 1000:>10.1f}"
+                         f"{(end - start) * 1000:>14.1f}")
+        if phases:
+            total = max(end for _, _, end in phases) - self.origin
+            lines.append(f"{'total':<16}{'':>10}{total * 1000:>14.1f}")
+        return '\n'.join(lines)
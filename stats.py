@@ -0,0 +1,235 @@
+"""Headless statistics over tracker data files (no Tk required).
+
+Usage:
+    python3 stats.py [task_data.json ...] [--date YYYY-MM-DD] [--format json|csv]
+                     [--workers N] [--output FILE]
+
+Each path may be a JSON data file, a SQLite database (.db) or a shard
+directory. Several files are processed in parallel in a process pool.
+Files are opened read-only; a damaged file is reported with a warning and
+its statistics cover only the records before the damage.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from aggregates import DailyAggregates, TaskDateIndex, WorkspaceIndex
+from config import DATA_FILE
+from data_manager import DataManager
+from storage import create_backend
+from storage.sharded_backend import month_summary
+
+
+def backend_name(path: str) -> str:
+    """Guess the storage backend of a path: shard directory, SQLite file or JSON."""
+    if os.path.isdir(path):
+        return 'sharded'
+    if path.endswith(('.db', '.sqlite', '.sqlite3')):
+        return 'sqlite'
+    return 'json'
+
+
+def load_file(path: str) -> Tuple[DataManager, Dict[str, Any]]:
+    """Open a data file read-only and return its manager and data with every month loaded."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{path} does not exist")
+    manager = DataManager(backend=create_backend(backend_name(path), path, read_only=True),
+                          rating_model='dict')
+    data = manager.load_data()
+    for year, month in manager.unloaded_months():
+        ratings, _summary = manager.load_month(year, month)
+        data['daily_ratings'].update(ratings)
+    return manager, data
+
+
+def streaks(rated_days: List[date], as_of: date) -> Dict[str, Any]:
+    """
+    Longest and current runs of consecutive rated days.
+
+    The current streak ends on ``as_of``, or on the day before if ``as_of``
+    has no ratings yet.
+    """
+    longest = current = 0
+    longest_end = None
+    run = 0
+    previous = None
+    for day in rated_days:
+        run = run + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        if run > longest:
+            longest, longest_end = run, day
+        previous = day
+    rated = set(rated_days)
+    day = as_of if as_of in rated else as_of - timedelta(days=1)
+    while day in rated:
+        current += 1
+        day -= timedelta(days=1)
+    return {
+        'current': current,
+        'longest': longest,
+        'longest_start': (longest_end - timedelta(days=longest - 1)).isoformat() if longest else None,
+        'longest_end': longest_end.isoformat() if longest else None
+    }
+
+
+def compute_stats(data: Dict[str, Any], as_of: date) -> Dict[str, Any]:
+    """
+    Compute the tracker's statistics for loaded data.
+
+    Day, week and total use the same definitions as the window's big
+    metrics; per-workspace, per-task and per-month numbers are averages of
+    daily averages over rated days.
+
+    Args:
+        data: Dictionary with 'global_tasks', 'daily_ratings', and 'workspaces'
+        as_of: Day the "day", "week" and "current streak" numbers refer to
+
+    Returns:
+        JSON-serializable dictionary of statistics
+    """
+    global_tasks = data['global_tasks']
+    daily_ratings = data['daily_ratings']
+    daily_aggregates = DailyAggregates()
+    daily_aggregates.rebuild(daily_ratings)
+    workspace_index = WorkspaceIndex()
+    workspace_index.rebuild(global_tasks, daily_ratings)
+    task_dates = TaskDateIndex()
+    task_dates.rebuild(daily_ratings)
+    as_of_str = as_of.isoformat()
+
+    workspaces = {}
+    for workspace in data['workspaces']:
+        average, days = workspace_index.overall_average(workspace)
+        workspaces[workspace] = {
+            'tasks': len(workspace_index.tasks(workspace)),
+            'day': workspace_index.day_average(as_of_str, workspace),
+            'average': average,
+            'rated_days': days
+        }
+
+    tasks = {}
+    for task_id, task in global_tasks.items():
+        history = task_dates.history(task_id, daily_ratings)
+        tasks[task_id] = {
+            'description': task.get('description', ''),
+            'workspace': task.get('workspace'),
+            'average': sum(history.values()) / len(history) if history else 0.0,
+            'ratings': len(history),
+            'last_rated': next(reversed(history), None)
+        }
+
+    by_month: Dict[str, Dict[str, Dict[str, int]]] = {}
+    for date_str, ratings in daily_ratings.items():
+        by_month.setdefault(date_str[:7], {})[date_str] = ratings
+    months = {}
+    for key in sorted(by_month):
+        total, days = month_summary(by_month[key])
+        if days:
+            months[key] = {'average': total / days, 'rated_days': days}
+
+    rated_days = sorted(date.fromisoformat(date_str) for date_str in daily_ratings
+                        if daily_aggregates.average(date_str) > 0)
+    return {
+        'date': as_of_str,
+        'day': daily_aggregates.average(as_of_str),
+        'week': daily_aggregates.range_average(as_of - timedelta(days=6), as_of),
+        'total': daily_aggregates.overall_average(),
+        'rated_days': len(rated_days),
+        'streaks': streaks(rated_days, as_of),
+        'workspaces': workspaces,
+        'tasks': tasks,
+        'months': months
+    }
+
+
+def file_stats(path: str, as_of: date) -> Dict[str, Any]:
+    """Load one data file and compute its statistics (runs in a worker process)."""
+    try:
+        manager, data = load_file(path)
+        try:
+            result = compute_stats(data, as_of)
+            result['load_complete'] = manager.load_complete
+            if not manager.load_complete:
+                result['warning'] = "file is damaged; only records before the damage are counted"
+        finally:
+            manager.close()
+    except Exception as e:
+        return {'file': path, 'error': str(e)}
+    return dict(file=path, **result)
+
+
+def collect(paths: List[str], as_of: date, workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Statistics for each path, in order; files are processed in parallel."""
+    if len(paths) == 1 or workers == 1:
+        return [file_stats(path, as_of) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(file_stats, paths, [as_of] * len(paths)))
+
+
+def to_csv(results: List[Dict[str, Any]]) -> str:
+    """
+    Flatten results into one long table.
+
+    Columns: file, table, key, metric, value. ``table`` is one of summary,
+    streak, workspace, task or month (or error and warning); ``key`` names
+    the workspace, task id or month.
+    """
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(['file', 'table', 'key', 'metric', 'value'])
+    for result in results:
+        path = result['file']
+        if 'error' in result:
+            writer.writerow([path, 'error', '', 'message', result['error']])
+            continue
+        if 'warning' in result:
+            writer.writerow([path, 'warning', '', 'message', result['warning']])
+        for metric in ('date', 'day', 'week', 'total', 'rated_days', 'load_complete'):
+            writer.writerow([path, 'summary', '', metric, result[metric]])
+        for metric, value in result['streaks'].items():
+            writer.writerow([path, 'streak', '', metric, value])
+        for table, rows in (('workspace', result['workspaces']), ('task', result['tasks']),
+                            ('month', result['months'])):
+            for key, values in rows.items():
+                for metric, value in values.items():
+                    writer.writerow([path, table, key, metric, value])
+    return out.getvalue()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compute tracker statistics without the UI")
+    parser.add_argument('files', nargs='*', default=[DATA_FILE],
+                        help="JSON data files, SQLite databases or shard directories")
+    parser.add_argument('--date', type=date.fromisoformat, default=date.today(),
+                        help="day for the day/week/streak numbers (default today)")
+    parser.add_argument('--format', choices=['json', 'csv'], default='json')
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for several files (default CPU count)")
+    parser.add_argument('--output', help="write to a file instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = collect(args.files, args.date, args.workers)
+    for result in results:
+        for level in ('error', 'warning'):
+            if level in result:
+                print(f"{result['file']}: {level}: {result[level]}", file=sys.stderr)
+    if args.format == 'csv':
+        text = to_csv(results)
+    else:
+        text = json.dumps(results, ensure_ascii=False, indent=2) + '\n'
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    return 1 if any('error' in result for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
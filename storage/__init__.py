@@ -0,0 +1,34 @@
+"""Storage backends for Modern Task Manager."""
+
+from storage.base import StorageBackend, apply_change, empty_data, inverse_change
+from storage.json_backend import JsonBackend
+
+
+def create_backend(name: str, path: str, journaled: bool = True,
+                   snapshot_format: str = 'json', read_only: bool = False) -> StorageBackend:
+    """
+    Create a storage backend by name.
+
+    Args:
+        name: 'json', 'sqlite' or 'sharded'
+        path: Data file (JSON/binary document or SQLite database) or shard directory
+        journaled: Use the change journal (JSON backend only)
+        snapshot_format: 'json' or 'binary' snapshots (JSON backend only)
+        read_only: Load without modifying anything on disk (shard
+            directories are only read by load anyway)
+    """
+    if name == 'json':
+        return JsonBackend(path, journaled=journaled, snapshot_format=snapshot_format,
+                           read_only=read_only)
+    if name == 'sqlite':
+        # Imported lazily so the default JSON setup does not load sqlite3
+        from storage.sqlite_backend import SqliteBackend
+        return SqliteBackend(path, read_only=read_only)
+    if name == 'sharded':
+        from storage.sharded_backend import ShardedBackend
+        return ShardedBackend(path)
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+__all__ = ['StorageBackend', 'JsonBackend', 'create_backend', 'apply_change', 'empty_data',
+           'inverse_change']
@@ -0,0 +1,121 @@
+"""Storage backend interface shared by all on-disk formats."""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List
+
+
+def empty_data() -> Dict[str, Any]:
+    """Return empty data structure."""
+    return {
+        'global_tasks': {},
+        'daily_ratings': {},
+        'workspaces': []
+    }
+
+
+def apply_change(data: Dict[str, Any], change: Dict[str, Any]) -> List[str]:
+    """
+    Apply a single mutation record to loaded data in place.
+
+    Returns the dates whose ratings changed.
+
+    Supported records:
+        {'op': 'rating', 'date': ..., 'task_id': ..., 'rating': ...}  (0 clears)
+        {'op': 'task', 'task_id': ..., 'task': {...}}
+        {'op': 'task_delete', 'task_id': ...}
+        {'op': 'workspaces', 'workspaces': [...]}
+    """
+    touched = []
+    op = change.get('op')
+    if op == 'rating':
+        date_str = change['date']
+        task_id = change['task_id']
+        rating = change['rating']
+        if rating > 0:
+            data['daily_ratings'].setdefault(date_str, {})[task_id] = rating
+        elif date_str in data['daily_ratings']:
+            data['daily_ratings'][date_str].pop(task_id, None)
+        touched.append(date_str)
+    elif op == 'task':
+        data['global_tasks'][change['task_id']] = change['task']
+    elif op == 'task_delete':
+        task_id = change['task_id']
+        data['global_tasks'].pop(task_id, None)
+        for date_str, ratings in data['daily_ratings'].items():
+            if ratings.pop(task_id, None) is not None:
+                touched.append(date_str)
+    elif op == 'workspaces':
+        data['workspaces'] = list(change['workspaces'])
+    return touched
+
+
+def inverse_change(data: Dict[str, Any], change: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Records that undo a mutation record, computed before it is applied.
+
+    A task_delete inverse restores only the task itself; to make a deletion
+    reversible, clear the task's ratings with rating records first and
+    their inverses restore them.
+    """
+    op = change.get('op')
+    if op == 'rating':
+        old = data['daily_ratings'].get(change['date'], {}).get(change['task_id'], 0)
+        return [{'op': 'rating', 'date': change['date'], 'task_id': change['task_id'],
+                 'rating': old}]
+    if op in ('task', 'task_delete'):
+        task_id = change['task_id']
+        old = data['global_tasks'].get(task_id)
+        if old is not None:
+            return [{'op': 'task', 'task_id': task_id, 'task': dict(old)}]
+        return [{'op': 'task_delete', 'task_id': task_id}] if op == 'task' else []
+    if op == 'workspaces':
+        return [{'op': 'workspaces', 'workspaces': list(data['workspaces'])}]
+    return []
+
+
+class StorageBackend(ABC):
+    """
+    Base class for storage backends.
+
+    A backend loads the whole state, writes full snapshots and, when
+    ``incremental`` is True, persists individual mutation records.
+    Write methods raise on failure; DataManager turns that into a bool.
+    load(), write_snapshot() and append_changes() are abstract, so a
+    backend missing one fails when it is created.
+    """
+
+    incremental = False
+    lazy = False  # True if ratings are loaded per month (see ShardedBackend)
+    streaming = False  # True if load() accepts on_progress/on_day (see JsonBackend)
+    load_complete = True  # False if the last load recovered a damaged file partially
+
+    @abstractmethod
+    def load(self) -> Dict[str, Any]:
+        """Load data as dict with 'global_tasks', 'daily_ratings', and 'workspaces'."""
+
+    def snapshot(self, global_tasks: Dict, daily_ratings: Dict, workspaces: List) -> Dict[str, Any]:
+        """
+        Copy the mutable state so it can be serialized off the main thread.
+
+        Only the containers are copied; keys and values are immutable.
+        """
+        return {
+            'global_tasks': {task_id: dict(task) for task_id, task in global_tasks.items()},
+            'daily_ratings': {date: dict(ratings) for date, ratings in daily_ratings.items()},
+            'workspaces': list(workspaces)
+        }
+
+    @abstractmethod
+    def write_snapshot(self, snapshot: Dict[str, Any]):
+        """Replace stored data with a snapshot. May run on a worker thread."""
+
+    @abstractmethod
+    def append_changes(self, changes: List[Dict[str, Any]]):
+        """Persist mutation records in the format understood by apply_change."""
+
+    def needs_compaction(self) -> bool:
+        """Check whether incremental records should be folded into a snapshot."""
+        return False
+
+    def close(self):
+        """Release resources held by the backend."""
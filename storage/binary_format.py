@@ -0,0 +1,210 @@
+"""Compact versioned binary snapshot format read through mmap.
+
+Layout (little endian):
+
+    header      MAGIC, version, counts and section offsets (HEADER struct)
+    strings     (count + 1) u32 offsets into the blob, then the UTF-8 blob
+    tasks       per task: task_id, description, workspace, criteria (u32 string indexes)
+    workspaces  per workspace: u32 string index
+    ratings     per rating: day ordinal u32, task_id string index u32, rating u8,
+                sorted by day
+
+Every string (task ids, descriptions, workspaces) is stored once and
+decoded once. The reader maps the file instead of reading it into a
+buffer; the whole snapshot is decoded at load time like a JSON one. The
+small sections come first, so a truncated file still yields its tasks and
+workspaces and the ratings up to the cut.
+"""
+
+import mmap
+import struct
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+from storage.base import empty_data
+
+MAGIC = b'PTRK'
+VERSION = 1
+
+HEADER = struct.Struct('<4sHHIIIIQQQQQ')
+OFFSET = struct.Struct('<I')
+STRING_SPAN = struct.Struct('<II')  # two consecutive offsets: start and end of one string
+TASK = struct.Struct('<IIII')
+WORKSPACE = struct.Struct('<I')
+RATING = struct.Struct('<IIB')
+
+
+def is_binary(path: str) -> bool:
+    """Check whether a file starts with the binary format magic."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def encode(snapshot: Dict[str, Any]) -> bytes:
+    """Serialize a snapshot dict (as produced by StorageBackend.snapshot)."""
+    strings: List[str] = []
+    interned: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        index = interned.get(value)
+        if index is None:
+            index = interned[value] = len(strings)
+            strings.append(value)
+        return index
+
+    tasks = b''.join(
+        TASK.pack(intern(task_id), intern(task.get('description', '')),
+                  intern(task.get('workspace') or ''), intern(task.get('description_criteria', '')))
+        for task_id, task in snapshot['global_tasks'].items())
+    workspaces = b''.join(WORKSPACE.pack(intern(name)) for name in snapshot['workspaces'])
+
+    records = []
+    for date_str, ratings in snapshot['daily_ratings'].items():
+        ordinal = date.fromisoformat(date_str).toordinal()
+        for task_id, rating in ratings.items():
+            if rating > 0:
+                records.append((ordinal, intern(task_id), rating))
+    records.sort()
+    ratings_blob = b''.join(RATING.pack(*record) for record in records)
+
+    encoded = [value.encode('utf-8') for value in strings]
+    offsets = [0]
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    strings_blob = b''.join(OFFSET.pack(o) for o in offsets) + b''.join(encoded)
+
+    strings_offset = HEADER.size
+    tasks_offset = strings_offset + len(strings_blob)
+    workspaces_offset = tasks_offset + len(tasks)
+    ratings_offset = workspaces_offset + len(workspaces)
+    header = HEADER.pack(MAGIC, VERSION, 0, len(strings),
+                         len(snapshot['global_tasks']), len(snapshot['workspaces']), len(records),
+                         strings_offset, tasks_offset, workspaces_offset, ratings_offset,
+                         snapshot.get('journal_seq', 0))
+    return header + strings_blob + tasks + workspaces + ratings_blob
+
+
+class BinaryReader:
+    """
+    Memory-mapped reader for the binary snapshot format.
+
+    Damaged files are read as far as possible: each section stops at the
+    first record that lies beyond the end of the file or does not decode,
+    and ``complete`` is set to False. Only an unreadable header raises.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError(f"{path} is empty")
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} has a truncated header")
+        (magic, version, _flags, self.string_count, self.task_count,
+         self.workspace_count, self.rating_count, self._strings_offset,
+         self._tasks_offset, self._workspaces_offset, self._ratings_offset,
+         self.journal_seq) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a binary data file")
+        if version > VERSION:
+            self.close()
+            raise ValueError(f"{path} uses unsupported format version {version}")
+        self._blob_offset = self._strings_offset + (self.string_count + 1) * OFFSET.size
+        self._strings: Dict[int, str] = {}
+        self.complete = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def string(self, index: int) -> str:
+        """
+        Decode one string table entry (cached).
+
+        Raises:
+            ValueError: The entry is out of range or lies beyond the end of the file
+        """
+        value = self._strings.get(index)
+        if value is None:
+            if not 0 <= index < self.string_count:
+                raise ValueError(f"string index {index} out of range")
+            start, end = self._unpack(STRING_SPAN, self._strings_offset + index * OFFSET.size)
+            if start > end or self._blob_offset + end > len(self._map):
+                raise ValueError(f"string {index} lies beyond the end of the file")
+            value = self._map[self._blob_offset + start:self._blob_offset + end].decode('utf-8')
+            self._strings[index] = value
+        return value
+
+    def tasks(self) -> Dict[str, Dict[str, str]]:
+        result = {}
+        try:
+            for i in range(self.task_count):
+                task_id, description, workspace, criteria = self._unpack(
+                    TASK, self._tasks_offset + i * TASK.size)
+                result[self.string(task_id)] = {
+                    'description': self.string(description),
+                    'workspace': self.string(workspace),
+                    'description_criteria': self.string(criteria)
+                }
+        except ValueError:
+            self.complete = False
+        return result
+
+    def workspaces(self) -> List[str]:
+        result = []
+        try:
+            for i in range(self.workspace_count):
+                index, = self._unpack(WORKSPACE, self._workspaces_offset + i * WORKSPACE.size)
+                result.append(self.string(index))
+        except ValueError:
+            self.complete = False
+        return result
+
+    def _unpack(self, record: struct.Struct, offset: int) -> tuple:
+        if offset + record.size > len(self._map):
+            raise ValueError(f"record at {offset} lies beyond the end of the file")
+        return record.unpack_from(self._map, offset)
+
+    def _rating_at(self, i: int) -> Tuple[int, int, int]:
+        return self._unpack(RATING, self._ratings_offset + i * RATING.size)
+
+    def daily_ratings(self) -> Dict[str, Dict[str, int]]:
+        """Ratings up to the first damaged record (records must be sorted by day)."""
+        result: Dict[str, Dict[str, int]] = {}
+        last_ordinal, day = 0, None
+        try:
+            for i in range(self.rating_count):
+                ordinal, task_index, rating = self._rating_at(i)
+                if ordinal < max(last_ordinal, 1) or rating == 0:
+                    raise ValueError(f"rating record {i} is damaged")
+                task_id = self.string(task_index)
+                if ordinal != last_ordinal:
+                    day = result.setdefault(date.fromordinal(ordinal).isoformat(), {})
+                    last_ordinal = ordinal
+                day[task_id] = rating
+        except ValueError:
+            self.complete = False
+        return result
+
+    def load(self) -> Dict[str, Any]:
+        """Read the whole snapshot into the usual data dict (check ``complete`` afterwards)."""
+        data = empty_data()
+        data['global_tasks'] = self.tasks()
+        data['workspaces'] = self.workspaces()
+        data['daily_ratings'] = self.daily_ratings()
+        return data
+
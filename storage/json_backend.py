@@ -0,0 +1,224 @@
+"""Whole-document storage with an append-only change journal."""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from storage import binary_format
+from storage.base import StorageBackend, apply_change, empty_data
+from storage.streaming import StreamingJsonLoader
+from config import JOURNAL_COMPACT_THRESHOLD
+
+
+class JsonBackend(StorageBackend):
+    """
+    Stores everything in one document file.
+
+    Snapshots are written as pretty-printed JSON or, with
+    ``snapshot_format='binary'``, in the compact mmap-able binary format.
+    The format is detected on load, so switching is transparent.
+
+    In journaled mode mutations are appended to ``<data_file>.journal`` and
+    folded into the snapshot on compaction. Each record carries a sequence
+    number; the snapshot stores the last one it contains, so records
+    appended while a snapshot is being written survive the journal trim.
+
+    With ``read_only=True`` load() leaves the files untouched: no
+    ``.corrupt`` copy is made and a torn journal tail is skipped, not cut.
+    """
+
+    streaming = True
+
+    def __init__(self, data_file: str, journaled: bool = True, snapshot_format: str = 'json',
+                 read_only: bool = False):
+        self.data_file = data_file
+        self.snapshot_format = snapshot_format
+        self.read_only = read_only
+        self.journal_file = data_file + '.journal'
+        self.journaled = journaled
+        self._journal_seq = 0
+        self._journal_records = 0
+        self._journal_lock = threading.Lock()
+
+    @property
+    def incremental(self) -> bool:
+        return self.journaled
+
+    def load(self, on_progress: Optional[Callable[[float], None]] = None,
+             on_day: Optional[Callable[[str, Dict[str, int]], None]] = None) -> Dict[str, Any]:
+        """
+        Load the snapshot and replay the change journal on top of it.
+
+        JSON snapshots are parsed incrementally (see StreamingJsonLoader). A
+        truncated or corrupt file yields everything before the first bad
+        record (binary snapshots: the intact part of each section); the
+        damaged file is kept as ``<data_file>.corrupt`` (unless read-only)
+        and ``load_complete`` is set to False.
+
+        Args:
+            on_progress: Called with the fraction of the snapshot read
+            on_day: Called with (date_str, ratings) for every loaded day, and
+                again for days changed by the journal replay
+        """
+        data = empty_data()
+        snapshot_seq = 0
+        self.load_complete = True
+        if binary_format.is_binary(self.data_file):
+            try:
+                with binary_format.BinaryReader(self.data_file) as reader:
+                    data = reader.load()
+                    snapshot_seq = reader.journal_seq
+                    self.load_complete = reader.complete
+            except ValueError:  # unreadable header
+                data = empty_data()
+                self.load_complete = False
+            if on_day:
+                for date_str, ratings in data['daily_ratings'].items():
+                    on_day(date_str, ratings)
+        elif os.path.exists(self.data_file):
+            data, snapshot_seq, self.load_complete = StreamingJsonLoader(
+                self.data_file, on_progress).load(on_day)
+        if not self.load_complete and not self.read_only:
+            shutil.copy2(self.data_file, self.data_file + '.corrupt')
+
+        self._journal_seq = snapshot_seq
+        self._journal_records = 0
+        if self.journaled:
+            touched = self._replay_journal(data, snapshot_seq)
+            if on_day:
+                for date_str in touched:
+                    on_day(date_str, data['daily_ratings'].get(date_str, {}))
+        return data
+
+    def write_snapshot(self, snapshot: Dict[str, Any]):
+        """
+        Serialize a snapshot and atomically replace the data file.
+
+        The snapshot must contain every record appended so far, which holds
+        when appends and snapshot writes go through one queue in order (see
+        SaveScheduler); the current journal sequence number is stored with it.
+        The data is written to a temporary file in the same directory, fsynced
+        and renamed over the old file, so a crash never leaves a partial file.
+        """
+        with self._journal_lock:
+            journal_seq = self._journal_seq
+        # Small keys first, so a truncated file loses only ratings
+        snapshot = {'global_tasks': snapshot['global_tasks'],
+                    'workspaces': snapshot['workspaces'],
+                    'journal_seq': journal_seq,
+                    'daily_ratings': snapshot['daily_ratings']}
+        directory = os.path.dirname(os.path.abspath(self.data_file))
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', dir=directory)
+        try:
+            if self.snapshot_format == 'binary':
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(binary_format.encode(snapshot))
+                    f.flush()
+                    os.fsync(f.fileno())
+            else:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(snapshot, f, ensure_ascii=False, indent=2)
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.data_file)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if self.journaled:
+            self._trim_journal(snapshot.get('journal_seq', 0))
+
+    def append_changes(self, changes: List[Dict[str, Any]]):
+        """Append mutation records to the journal."""
+        with self._journal_lock:
+            lines = []
+            for change in changes:
+                self._journal_seq += 1
+                record = dict(change, seq=self._journal_seq)
+                lines.append(json.dumps(record, ensure_ascii=False))
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_records += len(changes)
+
+    def needs_compaction(self) -> bool:
+        """Check whether the journal has grown enough to fold into a snapshot."""
+        return self.journaled and self._journal_records >= JOURNAL_COMPACT_THRESHOLD
+
+    def _replay_journal(self, data: Dict[str, Any], snapshot_seq: int) -> Set[str]:
+        """
+        Apply journal records newer than the snapshot; stop at a torn tail.
+
+        A record counts only once its line is complete (parses and ends with
+        a newline). A torn tail left by a crash mid-append is cut off, so
+        the next append starts on a clean line instead of behind garbage.
+
+        Returns:
+            Dates whose ratings were changed by the replay
+        """
+        touched = set()
+        if not os.path.exists(self.journal_file):
+            return touched
+        good_end = 0
+        torn = False
+        try:
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b'\n'):
+                            raise ValueError("torn record")
+                        record = json.loads(line)
+                    except ValueError:
+                        torn = True
+                        break
+                    good_end += len(line)
+                    seq = record.get('seq', 0)
+                    if seq <= snapshot_seq:
+                        continue
+                    touched.update(apply_change(data, record))
+                    self._journal_seq = max(self._journal_seq, seq)
+                    self._journal_records += 1
+            if torn and not self.read_only:
+                self._truncate_journal(good_end)
+        except OSError:
+            pass
+        return touched
+
+    def _truncate_journal(self, size: int):
+        """Cut the journal back to its first ``size`` bytes (the last complete record)."""
+        with self._journal_lock:
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(size)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _trim_journal(self, snapshot_seq: int):
+        """
+        Drop journal records folded into a snapshot.
+
+        Records appended while the snapshot was being written have a higher
+        sequence number and are kept.
+        """
+        with self._journal_lock:
+            if not os.path.exists(self.journal_file):
+                self._journal_records = 0
+                return
+            kept = []
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    if record.get('seq', 0) > snapshot_seq:
+                        kept.append(line if line.endswith('\n') else line + '\n')
+            tmp_path = self.journal_file + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.writelines(kept)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.journal_file)
+            self._journal_records = len(kept)
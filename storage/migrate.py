@@ -0,0 +1,98 @@
+"""One-shot migration of task_data.json into a SQLite database or month shards.
+
+Usage:
+    python -m storage.migrate [task_data.json] [task_data.db] [--force]
+    python -m storage.migrate --to sharded [task_data.json] [task_data] [--force]
+"""
+
+import argparse
+import os
+import sys
+from typing import Dict
+
+from config import DATA_FILE, SQLITE_FILE, SHARD_DIR
+from storage.json_backend import JsonBackend
+from storage.sharded_backend import ShardedBackend
+from storage.sqlite_backend import SqliteBackend
+
+
+def migrate_json_to_sqlite(json_file: str, db_file: str, force: bool = False) -> Dict[str, int]:
+    """
+    Copy all data from a JSON data file (plus its journal) into SQLite.
+
+    Args:
+        json_file: Source JSON file
+        db_file: Target SQLite database
+        force: Overwrite a database that already holds data
+
+    Returns:
+        Counts of migrated tasks, workspaces and ratings
+    """
+    source = JsonBackend(json_file)
+    target = SqliteBackend(db_file)
+    try:
+        if not force and not target.is_empty():
+            raise RuntimeError(f"{db_file} already contains data (use --force to overwrite)")
+        data = source.load()
+        target.write_snapshot(target.snapshot(data['global_tasks'], data['daily_ratings'],
+                                              data['workspaces']))
+    finally:
+        target.close()
+    return {
+        'tasks': len(data['global_tasks']),
+        'workspaces': len(data['workspaces']),
+        'ratings': sum(len(r) for r in data['daily_ratings'].values())
+    }
+
+
+def migrate_json_to_shards(json_file: str, directory: str, force: bool = False) -> Dict[str, int]:
+    """
+    Split a JSON data file (plus its journal) into month shards.
+
+    Args:
+        json_file: Source JSON file
+        directory: Target shard directory
+        force: Overwrite a directory that already holds an index
+
+    Returns:
+        Counts of migrated tasks, workspaces and ratings
+    """
+    if not force and os.path.exists(os.path.join(directory, ShardedBackend.INDEX_FILE)):
+        raise RuntimeError(f"{directory} already contains data (use --force to overwrite)")
+    data = JsonBackend(json_file).load()
+    ShardedBackend(directory).write_snapshot(data)
+    return {
+        'tasks': len(data['global_tasks']),
+        'workspaces': len(data['workspaces']),
+        'ratings': sum(len(r) for r in data['daily_ratings'].values())
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Migrate task_data.json to another backend")
+    parser.add_argument('json_file', nargs='?', default=DATA_FILE)
+    parser.add_argument('target', nargs='?',
+                        help=f"database file or shard directory "
+                             f"(default {SQLITE_FILE} / {SHARD_DIR})")
+    parser.add_argument('--to', choices=['sqlite', 'sharded'], default='sqlite',
+                        help="target backend")
+    parser.add_argument('--force', action='store_true',
+                        help="overwrite a target that already holds data")
+    args = parser.parse_args(argv)
+    try:
+        if args.to == 'sharded':
+            target = args.target or SHARD_DIR
+            counts = migrate_json_to_shards(args.json_file, target, force=args.force)
+        else:
+            target = args.target or SQLITE_FILE
+            counts = migrate_json_to_sqlite(args.json_file, target, force=args.force)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"Migrated {counts['tasks']} tasks, {counts['workspaces']} workspaces, "
+          f"{counts['ratings']} ratings to {target}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""Month-sharded storage with lazily loaded rating shards."""
+
+import itertools
+import json
+import os
+import tempfile
+import threading
+from calendar import monthrange
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from storage.base import StorageBackend, empty_data
+
+
+def month_key(year: int, month: int) -> str:
+    return f"{year:04d}-{month:02d}"
+
+
+def month_summary(ratings: Dict[str, Dict[str, int]]) -> Tuple[float, int]:
+    """(sum of daily averages, number of rated days) for a month of ratings."""
+    total, days = 0.0, 0
+    for day_ratings in ratings.values():
+        values = [rating for rating in day_ratings.values() if rating > 0]
+        if values:
+            total += sum(values) / len(values)
+            days += 1
+    return total, days
+
+
+class ShardedBackend(StorageBackend):
+    """
+    Stores ratings in one JSON file per month inside a directory.
+
+    ``index.json`` holds tasks, workspaces and a per-month summary
+    (sum of daily averages, rated days), so the all-time average needs no
+    shard. load() reads the index plus the current and previous month;
+    other months are read on demand with load_month(). Mutation records
+    only mark months dirty, and a save rewrites just those shards and the
+    index. Each mark is stamped with a counter; a month stays dirty until a
+    write containing its latest stamp succeeds, so snapshots that fail or
+    are skipped as superseded never lose it.
+    """
+
+    incremental = True
+    lazy = True
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._summaries: Dict[str, List] = {}
+        self._loaded_months = set()
+        self._stamps = itertools.count(1)
+        self._dirty_months: Dict[str, int] = {}  # month key -> stamp of its last change
+        self._meta_dirty = 0  # stamp of the last task/workspace change, 0 if clean
+
+    def load(self) -> Dict[str, Any]:
+        data = empty_data()
+        self._summaries = {}
+        self._loaded_months = set()
+        index_path = os.path.join(self.directory, self.INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            data['global_tasks'] = index.get('global_tasks', {})
+            data['workspaces'] = index.get('workspaces', [])
+            self._summaries = index.get('months', {})
+
+        today = date.today()
+        previous = (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+        for year, month in (previous, (today.year, today.month)):
+            data['daily_ratings'].update(self.load_month(year, month))
+        return data
+
+    def is_month_loaded(self, year: int, month: int) -> bool:
+        return month_key(year, month) in self._loaded_months
+
+    def load_month(self, year: int, month: int) -> Dict[str, Dict[str, int]]:
+        """Read one month shard and mark it loaded (empty dict if it has no ratings)."""
+        key = month_key(year, month)
+        self._loaded_months.add(key)
+        path = self._shard_path(key)
+        if not os.path.exists(path):
+            return {}
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def month_summary(self, year: int, month: int) -> Tuple[float, int]:
+        """Stored (sum of daily averages, rated days) of a month."""
+        with self._lock:
+            total, days = self._summaries.get(month_key(year, month), (0.0, 0))
+        return total, days
+
+    def unloaded_months(self) -> List[Tuple[int, int]]:
+        """(year, month) of stored months that are not loaded yet."""
+        with self._lock:
+            keys = sorted(self._summaries)
+        return [(int(key[:4]), int(key[5:])) for key in keys
+                if key not in self._loaded_months]
+
+    def unloaded_totals(self, first: Optional[Tuple[int, int]] = None,
+                        last: Optional[Tuple[int, int]] = None) -> Tuple[float, int]:
+        """Summed summaries of months that are not loaded, optionally only (year, month) first..last."""
+        low = month_key(*first) if first else ''
+        high = month_key(*last) if last else '9999-99'
+        total, days = 0.0, 0
+        with self._lock:
+            for key, (month_total, month_days) in self._summaries.items():
+                if key not in self._loaded_months and low <= key <= high:
+                    total += month_total
+                    days += month_days
+        return total, days
+
+    def append_changes(self, changes: List[Dict[str, Any]]):
+        """Mark the months and metadata touched by mutation records dirty."""
+        with self._lock:
+            for change in changes:
+                op = change.get('op')
+                stamp = next(self._stamps)
+                if op == 'rating':
+                    self._dirty_months[change['date'][:7]] = stamp
+                elif op == 'task_delete':
+                    # The task's ratings may be in any loaded month
+                    self._dirty_months.update(dict.fromkeys(self._loaded_months, stamp))
+                    self._meta_dirty = stamp
+                else:
+                    self._meta_dirty = stamp
+
+    def needs_compaction(self) -> bool:
+        return bool(self._dirty_months or self._meta_dirty)
+
+    def snapshot(self, global_tasks: Dict, daily_ratings: Dict, workspaces: List) -> Dict[str, Any]:
+        """Copy tasks, workspaces and only the dirty months' ratings."""
+        with self._lock:
+            dirty = dict(self._dirty_months)
+            meta_stamp = self._meta_dirty
+        months = {}
+        for key in dirty:
+            year, month = int(key[:4]), int(key[5:])
+            ratings = {}
+            for day in range(1, monthrange(year, month)[1] + 1):
+                date_str = f"{key}-{day:02d}"
+                day_ratings = daily_ratings.get(date_str)
+                if day_ratings:
+                    ratings[date_str] = dict(day_ratings)
+            months[key] = ratings
+        return {
+            'global_tasks': {task_id: dict(task) for task_id, task in global_tasks.items()},
+            'workspaces': list(workspaces),
+            'months': months,
+            'stamps': dirty,
+            'meta_stamp': meta_stamp
+        }
+
+    def write_snapshot(self, snapshot: Dict[str, Any]):
+        """
+        Rewrite the shards present in the snapshot, then the index.
+
+        A snapshot with full 'daily_ratings' (e.g. from DataManager.save_data
+        on a generic snapshot) rewrites every month it contains. On success,
+        months not changed again since the snapshot was taken are clean.
+        """
+        months = snapshot.get('months')
+        if months is None:
+            months = {}
+            for date_str, ratings in snapshot.get('daily_ratings', {}).items():
+                months.setdefault(date_str[:7], {})[date_str] = ratings
+        os.makedirs(self.directory, exist_ok=True)
+        for key, ratings in months.items():
+            summary = month_summary(ratings)
+            if summary[1]:
+                self._write_json(self._shard_path(key), ratings)
+            elif os.path.exists(self._shard_path(key)):
+                os.remove(self._shard_path(key))
+            with self._lock:
+                if summary[1]:
+                    self._summaries[key] = list(summary)
+                else:
+                    self._summaries.pop(key, None)
+        with self._lock:
+            summaries = dict(sorted(self._summaries.items()))
+        self._write_json(os.path.join(self.directory, self.INDEX_FILE), {
+            'version': 1,
+            'global_tasks': snapshot['global_tasks'],
+            'workspaces': snapshot['workspaces'],
+            'months': summaries
+        })
+        with self._lock:
+            for key, stamp in snapshot.get('stamps', {}).items():
+                if self._dirty_months.get(key) == stamp:
+                    del self._dirty_months[key]
+            if self._meta_dirty == snapshot.get('meta_stamp'):
+                self._meta_dirty = 0
+
+    def _shard_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"ratings-{key}.json")
+
+    @staticmethod
+    def _write_json(path: str, value):
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.tmp-', suffix='.json', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
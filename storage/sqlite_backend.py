@@ -0,0 +1,148 @@
+"""SQLite storage with per-row upserts."""
+
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List
+from urllib.request import pathname2url
+
+from storage.base import StorageBackend, empty_data
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workspaces (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    description TEXT NOT NULL,
+    workspace TEXT,
+    description_criteria TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_workspace ON tasks(workspace);
+CREATE TABLE IF NOT EXISTS ratings (
+    date TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    rating INTEGER NOT NULL,
+    PRIMARY KEY (date, task_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_ratings_task ON ratings(task_id);
+"""
+# Lookups by date use the (date, task_id) primary key prefix.
+
+
+class SqliteBackend(StorageBackend):
+    """
+    Stores tasks, workspaces and ratings in SQLite tables.
+
+    Every mutation record is applied as a single-row statement, so there is
+    nothing to compact. The connection is shared between the Tk thread and
+    the autosave worker and guarded by a lock. With ``read_only=True`` the
+    database is opened with ``mode=ro`` and the schema and pragmas are not
+    applied, so nothing is written to it.
+    """
+
+    incremental = True
+
+    def __init__(self, db_file: str, read_only: bool = False):
+        self.db_file = db_file
+        self._lock = threading.Lock()
+        if read_only:
+            uri = f"file:{pathname2url(os.path.abspath(db_file))}?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            return
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def load(self) -> Dict[str, Any]:
+        data = empty_data()
+        with self._lock:
+            cur = self._conn.cursor()
+            for name, in cur.execute("SELECT name FROM workspaces ORDER BY position"):
+                data['workspaces'].append(name)
+            for task_id, description, workspace, criteria in cur.execute(
+                    "SELECT task_id, description, workspace, description_criteria "
+                    "FROM tasks ORDER BY rowid"):
+                data['global_tasks'][task_id] = {
+                    'description': description,
+                    'workspace': workspace,
+                    'description_criteria': criteria
+                }
+            ratings = data['daily_ratings']
+            for date_str, task_id, rating in cur.execute(
+                    "SELECT date, task_id, rating FROM ratings ORDER BY date"):
+                ratings.setdefault(date_str, {})[task_id] = rating
+        return data
+
+    def write_snapshot(self, snapshot: Dict[str, Any]):
+        """Replace all rows with the snapshot in a single transaction."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ratings")
+            self._conn.execute("DELETE FROM tasks")
+            self._conn.execute("DELETE FROM workspaces")
+            self._insert_workspaces(snapshot['workspaces'])
+            self._conn.executemany(
+                "INSERT INTO tasks(task_id, description, workspace, description_criteria) "
+                "VALUES (?, ?, ?, ?)",
+                [self._task_row(task_id, task)
+                 for task_id, task in snapshot['global_tasks'].items()])
+            self._conn.executemany(
+                "INSERT INTO ratings(date, task_id, rating) VALUES (?, ?, ?)",
+                [(date_str, task_id, rating)
+                 for date_str, ratings in snapshot['daily_ratings'].items()
+                 for task_id, rating in ratings.items() if rating > 0])
+
+    def append_changes(self, changes: List[Dict[str, Any]]):
+        """Apply mutation records as single-row upserts and deletes."""
+        with self._lock, self._conn:
+            for change in changes:
+                op = change.get('op')
+                if op == 'rating':
+                    if change['rating'] > 0:
+                        self._conn.execute(
+                            "INSERT INTO ratings(date, task_id, rating) VALUES (?, ?, ?) "
+                            "ON CONFLICT(date, task_id) DO UPDATE SET rating = excluded.rating",
+                            (change['date'], change['task_id'], change['rating']))
+                    else:
+                        self._conn.execute(
+                            "DELETE FROM ratings WHERE date = ? AND task_id = ?",
+                            (change['date'], change['task_id']))
+                elif op == 'task':
+                    self._conn.execute(
+                        "INSERT INTO tasks(task_id, description, workspace, description_criteria) "
+                        "VALUES (?, ?, ?, ?) ON CONFLICT(task_id) DO UPDATE SET "
+                        "description = excluded.description, workspace = excluded.workspace, "
+                        "description_criteria = excluded.description_criteria",
+                        self._task_row(change['task_id'], change['task']))
+                elif op == 'task_delete':
+                    self._conn.execute("DELETE FROM ratings WHERE task_id = ?",
+                                       (change['task_id'],))
+                    self._conn.execute("DELETE FROM tasks WHERE task_id = ?",
+                                       (change['task_id'],))
+                elif op == 'workspaces':
+                    self._conn.execute("DELETE FROM workspaces")
+                    self._insert_workspaces(change['workspaces'])
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT (SELECT COUNT(*) FROM tasks) + (SELECT COUNT(*) FROM workspaces)"
+            ).fetchone()
+        return row[0] == 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _insert_workspaces(self, workspaces: List[str]):
+        self._conn.executemany("INSERT INTO workspaces(name, position) VALUES (?, ?)",
+                               [(name, i) for i, name in enumerate(workspaces)])
+
+    @staticmethod
+    def _task_row(task_id: str, task: Dict[str, Any]):
+        return (task_id, task.get('description', ''), task.get('workspace'),
+                task.get('description_criteria', ''))
@@ -0,0 +1,169 @@
+"""Incremental loader for large JSON snapshots."""
+
+import codecs
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from storage.base import empty_data
+
+_WHITESPACE = ' \t\n\r'
+
+
+class _Corrupt(Exception):
+    """Raised when the document cannot be parsed any further."""
+
+
+class StreamingJsonLoader:
+    """
+    Reads a snapshot in chunks and parses ``daily_ratings`` day by day.
+
+    Only the current chunk and the day being decoded are held as text, each
+    day is handed to ``on_day`` as soon as it is parsed, and ``on_progress``
+    receives the fraction of the file read. If the file is truncated or
+    corrupt, everything parsed before the first bad record is returned with
+    ``complete=False`` instead of discarding the whole file.
+    """
+
+    CHUNK_SIZE = 1 << 16
+    # Longest literal or escape the decoder may fail on before seeing its end
+    # ("\\uXXXX", "false"), so an error this close to the buffer end may
+    # just be a value split across chunks
+    _TAIL = 6
+
+    def __init__(self, path: str, on_progress: Optional[Callable[[float], None]] = None,
+                 chunk_size: int = CHUNK_SIZE):
+        self.path = path
+        self.on_progress = on_progress
+        self.chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        self._file = None
+        self._text_decoder = None
+        self._size = 0
+        self._read = 0
+
+    def load(self, on_day: Optional[Callable[[str, Dict[str, int]], None]] = None
+             ) -> Tuple[Dict[str, Any], int, bool]:
+        """
+        Parse the file.
+
+        Args:
+            on_day: Called with (date_str, ratings) for every parsed day
+
+        Returns:
+            (data, journal_seq, complete)
+        """
+        data = empty_data()
+        journal_seq = 0
+        complete = True
+        self._size = os.path.getsize(self.path) or 1
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        with open(self.path, 'rb') as self._file:
+            try:
+                self._expect('{')
+                if self._peek() == '}':
+                    self._pos += 1
+                else:
+                    while True:
+                        key = self._value()
+                        self._expect(':')
+                        if key == 'daily_ratings':
+                            self._daily_ratings(data['daily_ratings'], on_day)
+                        elif key == 'journal_seq':
+                            journal_seq = self._value()
+                        elif key in data:
+                            data[key] = self._value()
+                        else:
+                            self._value()
+                        if self._next_member('}'):
+                            break
+            except (_Corrupt, UnicodeDecodeError):
+                complete = False
+        if self.on_progress:
+            self.on_progress(1.0)
+        return data, journal_seq, complete
+
+    def _daily_ratings(self, target: Dict[str, Dict[str, int]], on_day):
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            date_str = self._value()
+            self._expect(':')
+            ratings = self._value()
+            if not isinstance(date_str, str) or not isinstance(ratings, dict):
+                raise _Corrupt()
+            target[date_str] = ratings
+            if on_day:
+                on_day(date_str, ratings)
+            if self._next_member('}'):
+                return
+
+    def _fill(self) -> bool:
+        """Read the next chunk; returns False at end of file."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self.chunk_size)
+        self._read += len(chunk)
+        self._buf = self._buf[self._pos:] + self._text_decoder.decode(chunk, final=not chunk)
+        self._pos = 0
+        if not chunk:
+            self._eof = True
+        if self.on_progress:
+            self.on_progress(min(self._read / self._size, 1.0))
+        return bool(chunk)
+
+    def _peek(self) -> str:
+        """Next non-whitespace character (not consumed)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise _Corrupt()
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise _Corrupt()
+        self._pos += 1
+
+    def _next_member(self, closing: str) -> bool:
+        """Consume ',' (returns False) or the closing bracket (returns True)."""
+        char = self._peek()
+        self._pos += 1
+        if char == ',':
+            return False
+        if char == closing:
+            return True
+        raise _Corrupt()
+
+    def _value(self):
+        """Decode one JSON value, reading more chunks until it is complete."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError as e:
+                # Only a value cut off by the end of the buffer can be
+                # completed by reading on; an error before that is corruption
+                if not self._truncated(e) or not self._fill():
+                    raise _Corrupt()
+                continue
+            # A number ending at the buffer edge may continue in the next chunk
+            if end == len(self._buf) and not self._eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def _truncated(self, error: json.JSONDecodeError) -> bool:
+        """True if a decode error may be caused by the value running past the buffer."""
+        # An unterminated string is reported at its opening quote, but the
+        # decoder only gives up on one after reaching the end of the buffer
+        return (error.msg.startswith('Unterminated string')
+                or error.pos >= len(self._buf) - self._TAIL)
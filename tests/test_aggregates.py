@@ -0,0 +1,180 @@
+"""Rating aggregates checked against brute-force recomputation."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from aggregates import DailyAggregates, RangeAverageIndex, TaskDateIndex, WorkspaceIndex
+
+
+def random_ratings(rng, days=90, tasks=6):
+    start = date(2025, 1, 1)
+    return {(start + timedelta(days=d)).isoformat():
+            {f't{t}': rng.randint(1, 5) for t in range(tasks) if rng.random() < 0.5}
+            for d in range(days) if rng.random() < 0.7}
+
+
+def brute_overall_average(ratings):
+    averages = [sum(day.values()) / len(day) for day in ratings.values() if day]
+    return sum(averages) / len(averages) if averages else 0.0
+
+
+def test_incremental_updates_match_rebuild():
+    rng = random.Random(1)
+    ratings = random_ratings(rng)
+    aggregates = DailyAggregates()
+    aggregates.rebuild(ratings)
+
+    for _ in range(200):
+        date_str = (date(2025, 1, 1) + timedelta(days=rng.randrange(120))).isoformat()
+        task_id = f't{rng.randrange(6)}'
+        day = ratings.setdefault(date_str, {})
+        old = day.get(task_id, 0)
+        new = rng.choice([0, 1, 2, 3, 4, 5])
+        if new:
+            day[task_id] = new
+        else:
+            day.pop(task_id, None)
+        aggregates.update(date_str, old, new)
+
+    expected = DailyAggregates()
+    expected.rebuild(ratings)
+    assert aggregates.overall_average() == pytest.approx(brute_overall_average(ratings))
+    for date_str, day in ratings.items():
+        assert aggregates.average(date_str) == pytest.approx(expected.average(date_str))
+        assert aggregates.average(date_str) == pytest.approx(sum(day.values()) / len(day)
+                                                             if day else 0.0)
+
+
+def brute_range_average(values, start, end):
+    window = [value for ordinal, value in values.items() if start <= ordinal <= end and value > 0]
+    return sum(window) / len(window) if window else 0.0
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_range_average_matches_brute_force(seed):
+    rng = random.Random(seed)
+    base = date(2024, 1, 1).toordinal()
+    values = {base + rng.randrange(400): rng.uniform(1, 5) for _ in range(150)}
+    index = RangeAverageIndex()
+    index.rebuild(values)
+
+    for step in range(300):
+        # Point updates, including clears and days outside the covered range
+        ordinal = base + rng.randrange(-800, 1200)
+        value = 0.0 if rng.random() < 0.3 else rng.uniform(1, 5)
+        index.set(ordinal, value)
+        if value > 0:
+            values[ordinal] = value
+        else:
+            values.pop(ordinal, None)
+
+        start = base + rng.randrange(-900, 1300)
+        end = start + rng.randrange(0, 500)
+        assert index.range_average(start, end) == pytest.approx(
+            brute_range_average(values, start, end))
+
+
+def test_daily_aggregates_range_average():
+    ratings = random_ratings(random.Random(3))
+    aggregates = DailyAggregates()
+    aggregates.rebuild(ratings)
+    aggregates.update('2025-02-10', ratings.get('2025-02-10', {}).get('t0', 0), 5)
+    ratings.setdefault('2025-02-10', {})['t0'] = 5
+
+    start, end = date(2025, 2, 1), date(2025, 3, 15)
+    window = {date.fromisoformat(day).toordinal(): sum(r.values()) / len(r)
+              for day, r in ratings.items() if r}
+    assert aggregates.range_average(start, end) == pytest.approx(
+        brute_range_average(window, start.toordinal(), end.toordinal()))
+    assert aggregates.average_on(date(2025, 2, 10)) == pytest.approx(
+        window[date(2025, 2, 10).toordinal()])
+
+
+def test_workspace_index_tasks_and_day_average():
+    tasks = {'a': {'workspace': 'W1'}, 'b': {'workspace': 'W2'}, 'c': {'workspace': 'W1'}}
+    ratings = {'2025-01-01': {'a': 2, 'b': 5, 'c': 4}}
+    index = WorkspaceIndex()
+    index.rebuild(tasks, ratings)
+
+    assert list(index.tasks('W1')) == ['a', 'c']
+    assert index.day_average('2025-01-01', 'W1') == 3.0
+    assert index.day_average('2025-01-01', 'W2') == 5.0
+    assert index.day_average('2025-01-02', 'W1') == 0.0
+
+    index.update_rating('2025-01-01', 'c', 4, 0)
+    index.update_rating('2025-01-01', 'a', 2, 0)
+    index.remove_task('a')
+    index.add_task('d', 'W1')
+    assert list(index.tasks('W1')) == ['c', 'd']
+    assert index.day_average('2025-01-01', 'W1') == 0.0
+
+
+def test_task_date_index_matches_scan():
+    ratings = random_ratings(random.Random(4))
+    index = TaskDateIndex()
+    index.rebuild(ratings)
+    for task_id in ('t0', 't3', 'missing'):
+        expected = sorted(day for day, r in ratings.items() if task_id in r)
+        assert index.dates(task_id) == expected
+        assert index.history(task_id, ratings) == {day: ratings[day][task_id] for day in expected}
+
+    first = index.dates('t0')[0]
+    index.update(first, 't0', 0)
+    index.update('2026-01-01', 't0', 3)
+    assert first not in index.dates('t0')
+    assert index.dates('t0')[-1] == '2026-01-01'
+
+
+def test_external_totals_count_in_overall_average():
+    aggregates = DailyAggregates()
+    aggregates.update('2025-01-01', 0, 4)
+    aggregates.add_external(6.0, 3)  # e.g. three unloaded days averaging 2.0
+    assert aggregates.overall_average() == pytest.approx(10.0 / 4)
+    aggregates.add_external(-6.0, -3)
+    assert aggregates.overall_average() == 4.0
+
+
+def test_set_day_matches_rebuild():
+    ratings = random_ratings(random.Random(2))
+    aggregates = DailyAggregates()
+    for date_str, day in ratings.items():
+        aggregates.set_day(date_str, day)
+    aggregates.set_day('2025-01-05', {'t0': 5})
+    ratings['2025-01-05'] = {'t0': 5}
+
+    expected = DailyAggregates()
+    expected.rebuild(ratings)
+    assert aggregates.overall_average() == pytest.approx(expected.overall_average())
+    assert aggregates.range_average(date(2025, 1, 1), date(2025, 12, 31)) == pytest.approx(
+        expected.range_average(date(2025, 1, 1), date(2025, 12, 31)))
+
+
+def test_workspace_index_move_task():
+    tasks = {'a': {'workspace': 'W1'}, 'b': {'workspace': 'W1'}}
+    ratings = {'2025-01-01': {'a': 2, 'b': 4}}
+    index = WorkspaceIndex()
+    index.rebuild(tasks, ratings)
+    assert index.day_average('2025-01-01', 'W1') == 3.0
+
+    index.move_task('b', 'W2', [('2025-01-01', 4)])
+
+    assert list(index.tasks('W1')) == ['a']
+    assert list(index.tasks('W2')) == ['b']
+    assert index.day_average('2025-01-01', 'W1') == 2.0
+    assert index.day_average('2025-01-01', 'W2') == 4.0
+
+
+def test_version_changes_on_every_mutation():
+    aggregates = DailyAggregates()
+    versions = {aggregates.version}
+    aggregates.update('2025-01-01', 0, 3)
+    versions.add(aggregates.version)
+    aggregates.set_day('2025-01-02', {'t': 4})
+    versions.add(aggregates.version)
+    aggregates.add_external(4.0, 1)
+    versions.add(aggregates.version)
+    aggregates.rebuild({})
+    versions.add(aggregates.version)
+    assert len(versions) == 5
@@ -0,0 +1,100 @@
+"""Binary snapshot format: round trip and recovery of damaged files."""
+
+import math
+
+import pytest
+
+from storage import JsonBackend, binary_format
+
+
+def make_snapshot():
+    return {
+        'global_tasks': {f't{i}': {'description': f'Задача {i}', 'workspace': 'CTF' if i % 2 else '',
+                                   'description_criteria': 'критерий' if i == 3 else ''}
+                         for i in range(8)},
+        'workspaces': ['CTF', 'Тренировки'],
+        'journal_seq': 42,
+        'daily_ratings': {f'2024-{m:02d}-{d:02d}': {f't{(m + d + k) % 8}': (m * d + k) % 5 + 1
+                                                    for k in range(3)}
+                          for m in range(1, 13) for d in (1, 9, 17, 25)},
+    }
+
+
+def write_binary(path, snapshot, cut=None):
+    blob = binary_format.encode(snapshot)
+    path.write_bytes(blob if cut is None else blob[:cut])
+    return blob
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'data.bin'
+    snapshot = make_snapshot()
+    write_binary(path, snapshot)
+
+    assert binary_format.is_binary(str(path))
+    with binary_format.BinaryReader(str(path)) as reader:
+        data = reader.load()
+        assert reader.complete
+        assert reader.journal_seq == 42
+
+    assert data['global_tasks'] == snapshot['global_tasks']
+    assert data['workspaces'] == snapshot['workspaces']
+    assert data['daily_ratings'] == snapshot['daily_ratings']
+
+
+def test_unrated_entries_are_not_stored(tmp_path):
+    path = tmp_path / 'data.bin'
+    write_binary(path, {'global_tasks': {}, 'workspaces': [], 'daily_ratings': {
+        '2024-01-01': {'a': 0, 'b': 4}}})
+
+    with binary_format.BinaryReader(str(path)) as reader:
+        assert reader.load()['daily_ratings'] == {'2024-01-01': {'b': 4}}
+
+
+@pytest.mark.parametrize('lost', [1, 9, 100])
+def test_truncated_ratings_keep_tables_and_prefix(tmp_path, lost):
+    path = tmp_path / 'data.bin'
+    snapshot = make_snapshot()
+    blob = write_binary(path, snapshot)
+    path.write_bytes(blob[:-lost])
+
+    with binary_format.BinaryReader(str(path)) as reader:
+        data = reader.load()
+        assert not reader.complete
+
+    assert data['global_tasks'] == snapshot['global_tasks']
+    assert data['workspaces'] == snapshot['workspaces']
+    recovered = [(date_str, task_id, rating) for date_str, ratings in data['daily_ratings'].items()
+                 for task_id, rating in ratings.items()]
+    original = sorted((date_str, task_id, rating)
+                      for date_str, ratings in snapshot['daily_ratings'].items()
+                      for task_id, rating in ratings.items())
+    assert sorted(recovered) == original[:len(recovered)]
+    assert len(recovered) == len(original) - math.ceil(lost / binary_format.RATING.size)
+
+
+def test_backend_marks_damaged_binary_incomplete(tmp_path):
+    path = tmp_path / 'data.json'
+    snapshot = make_snapshot()
+    blob = write_binary(path, snapshot)
+    path.write_bytes(blob[:len(blob) // 2])
+
+    backend = JsonBackend(str(path), journaled=False)
+    data = backend.load()
+
+    assert not backend.load_complete
+    assert (tmp_path / 'data.json.corrupt').exists()
+    # The day at the cut may have lost some of its records
+    assert all(snapshot['daily_ratings'][date_str] == ratings or date_str == max(data['daily_ratings'])
+               for date_str, ratings in data['daily_ratings'].items())
+
+
+def test_backend_survives_truncated_header(tmp_path):
+    path = tmp_path / 'data.json'
+    write_binary(path, make_snapshot(), cut=10)
+
+    backend = JsonBackend(str(path), journaled=False)
+    data = backend.load()
+
+    assert not backend.load_complete
+    assert data == {'global_tasks': {}, 'daily_ratings': {}, 'workspaces': []}
@@ -0,0 +1,116 @@
+"""Undo/redo of mutation records through inverse_change."""
+
+import copy
+
+from history import UndoHistory
+from storage import apply_change, empty_data, inverse_change
+
+
+def make_data():
+    data = empty_data()
+    data['workspaces'] = ['W']
+    data['global_tasks'] = {'a': {'description': 'A', 'workspace': 'W', 'description_criteria': ''},
+                            'b': {'description': 'B', 'workspace': 'W', 'description_criteria': ''}}
+    data['daily_ratings'] = {'2025-01-01': {'a': 3, 'b': 5}, '2025-01-02': {'a': 4}}
+    return data
+
+
+def commit(data, history, changes):
+    """Apply records and record them the way the app does (inverses computed before each)."""
+    inverse = []
+    for change in changes:
+        inverse[:0] = inverse_change(data, change)
+        apply_change(data, change)
+    history.record(list(changes), inverse)
+
+
+def apply_all(data, changes):
+    for change in changes:
+        apply_change(data, change)
+
+
+def normalized(data):
+    """Drop days left empty by cleared ratings; they are equivalent to missing days."""
+    result = copy.deepcopy(data)
+    result['daily_ratings'] = {day: ratings for day, ratings in result['daily_ratings'].items()
+                               if ratings}
+    return result
+
+
+def test_undo_redo_task_deletion():
+    data = make_data()
+    before = copy.deepcopy(data)
+    history = UndoHistory()
+    # Ratings are cleared as separate records so their inverses restore them
+    changes = [{'op': 'rating', 'date': date_str, 'task_id': 'a', 'rating': 0}
+               for date_str in ('2025-01-01', '2025-01-02')]
+    changes.append({'op': 'task_delete', 'task_id': 'a'})
+    commit(data, history, changes)
+    after = normalized(data)
+    assert 'a' not in data['global_tasks']
+
+    apply_all(data, history.undo())
+    assert normalized(data) == before
+    assert not history.can_undo() and history.can_redo()
+
+    apply_all(data, history.redo())
+    assert normalized(data) == after
+    assert history.can_undo() and not history.can_redo()
+
+
+def test_undo_sequence_restores_every_state():
+    data = make_data()
+    history = UndoHistory()
+    states = [normalized(data)]
+    for changes in (
+            [{'op': 'rating', 'date': '2025-01-03', 'task_id': 'b', 'rating': 2}],
+            [{'op': 'task', 'task_id': 'b',
+              'task': {'description': 'B2', 'workspace': 'X', 'description_criteria': ''}}],
+            [{'op': 'workspaces', 'workspaces': ['W', 'X']}],
+            [{'op': 'task', 'task_id': 'c',
+              'task': {'description': 'C', 'workspace': 'X', 'description_criteria': ''}}]):
+        commit(data, history, changes)
+        states.append(normalized(data))
+
+    for state in reversed(states[:-1]):
+        apply_all(data, history.undo())
+        assert normalized(data) == state
+    assert history.undo() is None
+
+    for state in states[1:]:
+        apply_all(data, history.redo())
+        assert normalized(data) == state
+    assert history.redo() is None
+
+
+def test_new_action_clears_redo():
+    data = make_data()
+    history = UndoHistory()
+    commit(data, history, [{'op': 'rating', 'date': '2025-01-01', 'task_id': 'a', 'rating': 1}])
+    history.undo()
+    commit(data, history, [{'op': 'rating', 'date': '2025-01-01', 'task_id': 'b', 'rating': 1}])
+    assert not history.can_redo()
+
+
+def test_budget_drops_oldest_entries():
+    history = UndoHistory(budget_bytes=400)
+    for i in range(50):
+        change = {'op': 'rating', 'date': '2025-01-01', 'task_id': f't{i}', 'rating': 3}
+        history.record([change], [dict(change, rating=0)])
+        assert history.memory_used <= 400
+
+    undone = []
+    while history.can_undo():
+        undone.append(history.undo()[0]['task_id'])
+    assert undone and undone[0] == 't49'
+    assert len(undone) < 50
+
+
+def test_oversized_entry_clears_history():
+    history = UndoHistory(budget_bytes=100)
+    history.record([{'op': 'workspaces', 'workspaces': ['W']}], [{'op': 'workspaces',
+                                                                  'workspaces': []}])
+    history.record([{'op': 'workspaces', 'workspaces': ['x' * 200]}],
+                   [{'op': 'workspaces', 'workspaces': ['W']}])
+    assert not history.can_undo()
+    assert history.memory_used == 0
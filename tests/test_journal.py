@@ -0,0 +1,45 @@
+"""Journaled JSON backend: replay and recovery from a torn journal tail."""
+
+import pytest
+
+from storage import JsonBackend
+
+
+def rating(date_str, value):
+    return {'op': 'rating', 'date': date_str, 'task_id': 't', 'rating': value}
+
+
+def test_replay_applies_records_newer_than_snapshot(tmp_path):
+    path = str(tmp_path / 'data.json')
+    backend = JsonBackend(path)
+    backend.load()
+    backend.append_changes([rating('2025-01-01', 2)])
+    backend.write_snapshot(backend.snapshot({}, {'2025-01-01': {'t': 2}}, ['W']))
+    backend.append_changes([rating('2025-01-01', 5), rating('2025-01-02', 1)])
+
+    data = JsonBackend(path).load()
+
+    assert data['daily_ratings'] == {'2025-01-01': {'t': 5}, '2025-01-02': {'t': 1}}
+    assert data['workspaces'] == ['W']
+
+
+@pytest.mark.parametrize('tail', [b'{"op": "rating", "date": "2025-01-0',
+                                  b'{"op": "rating", "date": "2025-01-09", "task_id": "t", '
+                                  b'"rating": 3, "seq": 2}'])
+def test_torn_tail_does_not_swallow_later_records(tmp_path, tail):
+    path = str(tmp_path / 'data.json')
+    backend = JsonBackend(path)
+    backend.load()
+    backend.append_changes([rating('2025-01-01', 4)])
+    # Crash in the middle of the next append: no trailing newline
+    with open(path + '.journal', 'ab') as f:
+        f.write(tail)
+
+    session = JsonBackend(path)
+    assert session.load()['daily_ratings'] == {'2025-01-01': {'t': 4}}
+    session.append_changes([rating('2025-01-02', 5)])
+    session.append_changes([rating('2025-01-03', 1)])
+
+    data = JsonBackend(path).load()
+    assert data['daily_ratings'] == {'2025-01-01': {'t': 4}, '2025-01-02': {'t': 5},
+                                     '2025-01-03': {'t': 1}}
@@ -0,0 +1,79 @@
+"""Rating matrix model checked against the plain dict model."""
+
+import random
+from datetime import date, timedelta
+
+from data_manager import MatrixDailyRatings, MatrixTaskDateIndex, RatingMatrix
+
+
+def apply_random_ops(rng, reference, ratings, count=2000):
+    """Apply the same random sets and clears to a dict and a matrix model."""
+    start = date(2024, 12, 20)
+    for _ in range(count):
+        # Dates spread both ways from the first one so the matrix grows at each end
+        day = (start + timedelta(days=rng.randint(-400, 400))).isoformat()
+        task_id = f"task-{rng.randrange(40)}"
+        value = rng.choice([0, 0, 1, 2, 3, 4, 5])
+        if value:
+            reference.setdefault(day, {})[task_id] = value
+        elif task_id in reference.get(day, {}):
+            del reference[day][task_id]
+            if not reference[day]:
+                del reference[day]
+        ratings.setdefault(day, {})[task_id] = value
+
+
+def as_dict(ratings):
+    return {day: dict(ratings[day]) for day in ratings}
+
+
+def test_matrix_matches_dict_reference():
+    rng = random.Random(7)
+    reference = {}
+    ratings = MatrixDailyRatings()
+    apply_random_ops(rng, reference, ratings)
+
+    assert as_dict(ratings) == reference
+    assert list(ratings) == sorted(reference)
+    assert len(ratings) == len(reference)
+    day = next(iter(reference))
+    assert day in ratings
+    assert len(ratings[day]) == len(reference[day])
+    assert '1999-01-01' not in ratings
+
+    index = MatrixTaskDateIndex(ratings.matrix)
+    for task_id in ('task-0', 'task-17', 'missing'):
+        expected = sorted(d for d, r in reference.items() if task_id in r)
+        assert index.dates(task_id) == expected
+        assert index.history(task_id) == {d: reference[d][task_id] for d in expected}
+
+
+def test_from_dict_round_trip():
+    reference = {'2025-01-01': {'a': 3, 'b': 5}, '2025-03-10': {'a': 1}}
+    ratings = MatrixDailyRatings.from_dict(reference)
+    assert as_dict(ratings) == reference
+
+    ratings['2025-01-01'] = {'c': 2}
+    del ratings['2025-03-10']
+    assert as_dict(ratings) == {'2025-01-01': {'c': 2}}
+
+
+def test_columns_grow_and_removed_columns_are_reused():
+    matrix = RatingMatrix(task_capacity=2)
+    day = date(2025, 1, 1).toordinal()
+    for n in range(5):
+        matrix.set(day + n, f"t{n}", n + 1)
+    assert matrix.task_capacity >= 5
+    assert [matrix.get(day + n, f"t{n}") for n in range(5)] == [1, 2, 3, 4, 5]
+
+    col = matrix.column('t2')
+    matrix.remove_task('t2')
+    assert matrix.get(day + 2, 't2') == 0
+    assert matrix.count(day + 2) == 0
+    assert list(matrix.task_days('t2')) == []
+
+    # A new task takes the freed column and starts out unrated
+    matrix.set(day, 'new', 4)
+    assert matrix.column('new') == col
+    assert list(matrix.task_days('new')) == [day]
+    assert sorted(matrix.day_items(day)) == [('new', 4), ('t0', 1)]
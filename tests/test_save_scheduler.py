@@ -0,0 +1,99 @@
+"""SaveScheduler ordering and coalescing against real backends."""
+
+import threading
+
+from data_manager import DataManager, SaveScheduler
+from storage import JsonBackend, apply_change
+from storage.sharded_backend import ShardedBackend
+
+
+class Timers:
+    """``after``/``after_cancel`` stand-ins; timers only run when fired explicitly."""
+
+    def __init__(self):
+        self.pending = {}
+        self._next = 0
+
+    def schedule(self, ms, func):
+        self._next += 1
+        self.pending[self._next] = func
+        return self._next
+
+    def cancel(self, timer_id):
+        self.pending.pop(timer_id, None)
+
+
+def make_scheduler(backend, state):
+    timers = Timers()
+    errors = []
+    scheduler = SaveScheduler(DataManager(backend=backend), lambda: state,
+                              timers.schedule, timers.cancel, on_error=lambda: errors.append(1))
+    return scheduler, errors
+
+
+def commit(scheduler, state, change):
+    apply_change(state, change)
+    scheduler.append_changes([change])
+
+
+def rating(date_str, value):
+    return {'op': 'rating', 'date': date_str, 'task_id': 't', 'rating': value}
+
+
+def test_journal_records_and_snapshots_are_written_in_order(tmp_path):
+    path = str(tmp_path / 'data.json')
+    backend = JsonBackend(path)
+    state = backend.load()
+    scheduler, errors = make_scheduler(backend, state)
+
+    commit(scheduler, state, rating('2025-01-01', 2))
+    scheduler.mark_dirty()
+    scheduler.flush()  # writes a snapshot after the first record
+    commit(scheduler, state, rating('2025-01-01', 5))
+    commit(scheduler, state, rating('2025-01-02', 1))
+    scheduler.close()
+
+    assert not errors
+    assert JsonBackend(path).load()['daily_ratings'] == state['daily_ratings']
+
+
+def test_failed_append_is_reported_on_the_main_thread(tmp_path):
+    backend = JsonBackend(str(tmp_path / 'missing-dir' / 'data.json'))
+    state = backend.load()
+    scheduler, errors = make_scheduler(backend, state)
+
+    commit(scheduler, state, rating('2025-01-01', 3))
+    scheduler.flush()
+
+    assert errors == [1]
+    scheduler.close()
+
+
+def test_skipped_sharded_snapshot_keeps_its_months(tmp_path):
+    backend = ShardedBackend(str(tmp_path / 'shards'))
+    state = backend.load()
+    scheduler, errors = make_scheduler(backend, state)
+    release = threading.Event()
+    write_snapshot = backend.write_snapshot
+
+    def blocked_write(snapshot):
+        release.wait()
+        write_snapshot(snapshot)
+
+    backend.write_snapshot = blocked_write
+    # Months are marked dirty directly, so each snapshot is taken with its
+    # month already dirty while the worker is still busy
+    for change in ({'op': 'workspaces', 'workspaces': ['W']},
+                   rating('2025-03-05', 4), rating('2025-06-07', 4)):
+        apply_change(state, change)
+        backend.append_changes([change])
+        scheduler._submit()  # the first blocks the worker; 2025-03 is superseded by 2025-06
+    release.set()
+    scheduler.close()
+
+    reloaded = ShardedBackend(str(tmp_path / 'shards'))
+    reloaded.load()
+    assert not errors
+    assert reloaded.load_month(2025, 3) == {'2025-03-05': {'t': 4}}
+    assert reloaded.load_month(2025, 6) == {'2025-06-07': {'t': 4}}
+    assert not backend.needs_compaction()
@@ -0,0 +1,68 @@
+"""Month-sharded backend: lazy month loading and unloaded-month totals."""
+
+import random
+
+import pytest
+
+from data_manager import DataManager
+from storage.sharded_backend import ShardedBackend, month_summary
+
+
+def write_store(directory, ratings):
+    backend = ShardedBackend(directory)
+    backend.load()
+    backend.append_changes([{'op': 'rating', 'date': date_str, 'task_id': task_id, 'rating': value}
+                            for date_str, day in ratings.items() for task_id, value in day.items()])
+    backend.write_snapshot(backend.snapshot({'t0': {'description': 'Задача'}}, ratings, ['W']))
+
+
+def random_ratings(rng):
+    ratings = {}
+    for month in range(1, 13):
+        for day in rng.sample(range(1, 29), 5):
+            ratings[f"2023-{month:02d}-{day:02d}"] = {f"t{k}": rng.randint(1, 5)
+                                                      for k in range(rng.randint(1, 4))}
+    return ratings
+
+
+def brute_totals(ratings, first, last):
+    low, high = f"{first[0]:04d}-{first[1]:02d}", f"{last[0]:04d}-{last[1]:02d}"
+    return month_summary({date_str: day for date_str, day in ratings.items()
+                          if low <= date_str[:7] <= high})
+
+
+def test_months_are_loaded_on_demand(tmp_path):
+    directory = str(tmp_path / 'shards')
+    ratings = random_ratings(random.Random(1))
+    write_store(directory, ratings)
+
+    manager = DataManager(backend=ShardedBackend(directory))
+    data = manager.load_data()
+    assert data['global_tasks'] == {'t0': {'description': 'Задача'}}
+    assert data['workspaces'] == ['W']
+    assert manager.unloaded_months() == [(2023, month) for month in range(1, 13)]
+    assert not manager.is_month_loaded(2023, 4)
+
+    april, summary = manager.load_month(2023, 4)
+    assert april == {date_str: day for date_str, day in ratings.items() if date_str.startswith('2023-04')}
+    assert summary == pytest.approx(month_summary(april))
+    assert manager.is_month_loaded(2023, 4)
+    assert (2023, 4) not in manager.unloaded_months()
+
+
+@pytest.mark.parametrize('first, last', [((2023, 1), (2023, 12)), ((2023, 3), (2023, 7)),
+                                         ((2022, 1), (2023, 2)), ((2024, 1), (2024, 6))])
+def test_unloaded_totals_match_brute_force(tmp_path, first, last):
+    directory = str(tmp_path / 'shards')
+    ratings = random_ratings(random.Random(2))
+    write_store(directory, ratings)
+    manager = DataManager(backend=ShardedBackend(directory))
+    manager.load_data()
+
+    assert manager.unloaded_totals(first, last) == pytest.approx(brute_totals(ratings, first, last))
+    assert manager.unloaded_totals() == pytest.approx(month_summary(ratings))
+
+    # A loaded month leaves the unloaded totals; its ratings are counted in memory instead
+    manager.load_month(2023, 5)
+    rest = {date_str: day for date_str, day in ratings.items() if not date_str.startswith('2023-05')}
+    assert manager.unloaded_totals(first, last) == pytest.approx(brute_totals(rest, first, last))
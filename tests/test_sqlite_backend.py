@@ -0,0 +1,71 @@
+"""SQLite backend: snapshot round trip and incremental writes."""
+
+import pytest
+
+from storage.sqlite_backend import SqliteBackend
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'data.db')
+
+
+def make_snapshot():
+    return {
+        'global_tasks': {'a': {'description': 'Задача A', 'workspace': 'CTF',
+                               'description_criteria': 'критерий'},
+                         'b': {'description': 'B', 'workspace': None, 'description_criteria': ''}},
+        'workspaces': ['CTF', 'Развитие', 'Bug Bounty'],
+        'daily_ratings': {'2025-01-01': {'a': 3, 'b': 5}, '2025-01-02': {'a': 1}},
+    }
+
+
+def reload(db_path):
+    backend = SqliteBackend(db_path)
+    try:
+        return backend.load()
+    finally:
+        backend.close()
+
+
+def test_snapshot_round_trip(db_path):
+    backend = SqliteBackend(db_path)
+    assert backend.is_empty()
+    backend.write_snapshot(make_snapshot())
+    backend.close()
+
+    assert reload(db_path) == make_snapshot()
+
+
+def test_snapshot_replaces_previous_rows(db_path):
+    backend = SqliteBackend(db_path)
+    backend.write_snapshot(make_snapshot())
+    backend.write_snapshot({'global_tasks': {}, 'workspaces': ['W'],
+                            'daily_ratings': {'2025-02-01': {'x': 4, 'y': 0}}})
+    backend.close()
+
+    assert reload(db_path) == {'global_tasks': {}, 'workspaces': ['W'],
+                               'daily_ratings': {'2025-02-01': {'x': 4}}}
+
+
+def test_incremental_changes(db_path):
+    backend = SqliteBackend(db_path)
+    backend.write_snapshot(make_snapshot())
+    backend.append_changes([
+        {'op': 'rating', 'date': '2025-01-01', 'task_id': 'a', 'rating': 4},  # upsert
+        {'op': 'rating', 'date': '2025-01-02', 'task_id': 'a', 'rating': 0},  # clear
+        {'op': 'rating', 'date': '2025-01-03', 'task_id': 'b', 'rating': 2},
+        {'op': 'task', 'task_id': 'b', 'task': {'description': 'B2', 'workspace': 'CTF'}},
+        {'op': 'task', 'task_id': 'c', 'task': {'description': 'C', 'workspace': 'CTF'}},
+        {'op': 'workspaces', 'workspaces': ['Развитие', 'CTF']},
+    ])
+    backend.append_changes([{'op': 'task_delete', 'task_id': 'a'}])
+    backend.close()
+
+    data = reload(db_path)
+    assert data['workspaces'] == ['Развитие', 'CTF']
+    assert data['daily_ratings'] == {'2025-01-01': {'b': 5}, '2025-01-03': {'b': 2}}
+    assert data['global_tasks'] == {
+        'b': {'description': 'B2', 'workspace': 'CTF', 'description_criteria': ''},
+        'c': {'description': 'C', 'workspace': 'CTF', 'description_criteria': ''},
+    }
@@ -0,0 +1,114 @@
+"""Headless statistics: computed numbers, CLI output and read-only loading."""
+
+import csv
+import io
+import json
+import sqlite3
+from datetime import date
+
+import pytest
+
+import stats
+from storage import JsonBackend
+from storage.sqlite_backend import SqliteBackend
+
+DATA = {
+    'global_tasks': {'a': {'description': 'Зарядка', 'workspace': 'Здоровье'},
+                     'b': {'description': 'Чтение', 'workspace': 'Развитие'},
+                     'c': {'description': 'CTF', 'workspace': 'Развитие'}},
+    'workspaces': ['Здоровье', 'Развитие'],
+    'daily_ratings': {'2025-01-28': {'a': 5},
+                      '2025-01-30': {'a': 4, 'b': 2},
+                      '2025-01-31': {'b': 3, 'c': 5},
+                      '2025-02-01': {'a': 1, 'c': 3}},
+}
+
+
+def write_json(path, data=DATA):
+    backend = JsonBackend(str(path))
+    backend.write_snapshot(backend.snapshot(data['global_tasks'], data['daily_ratings'],
+                                            data['workspaces']))
+
+
+def test_compute_stats():
+    result = stats.compute_stats(DATA, date(2025, 2, 1))
+
+    assert result['day'] == 2.0
+    assert result['week'] == pytest.approx((5 + 3 + 4 + 2) / 4)
+    assert result['total'] == pytest.approx((5 + 3 + 4 + 2) / 4)
+    assert result['rated_days'] == 4
+    assert result['streaks'] == {'current': 3, 'longest': 3,
+                                 'longest_start': '2025-01-30', 'longest_end': '2025-02-01'}
+    assert result['workspaces']['Развитие'] == {'tasks': 2, 'day': 3.0,
+                                                'average': pytest.approx((2 + 4 + 3) / 3),
+                                                'rated_days': 3}
+    assert result['tasks']['a'] == {'description': 'Зарядка', 'workspace': 'Здоровье',
+                                    'average': pytest.approx(10 / 3), 'ratings': 3,
+                                    'last_rated': '2025-02-01'}
+    assert result['months'] == {'2025-01': {'average': 4.0, 'rated_days': 3},
+                                '2025-02': {'average': 2.0, 'rated_days': 1}}
+
+
+def test_current_streak_continues_from_yesterday():
+    result = stats.compute_stats(DATA, date(2025, 2, 2))
+    assert result['day'] == 0.0
+    assert result['streaks']['current'] == 3
+
+
+def test_cli_reports_each_file(tmp_path, capsys):
+    json_path = tmp_path / 'data.json'
+    write_json(json_path)
+    db_path = tmp_path / 'data.db'
+    backend = SqliteBackend(str(db_path))
+    backend.write_snapshot(backend.snapshot(DATA['global_tasks'], DATA['daily_ratings'],
+                                            DATA['workspaces']))
+    backend.close()
+    output = tmp_path / 'out.json'
+
+    code = stats.main([str(json_path), str(db_path), str(tmp_path / 'missing.json'),
+                       '--date', '2025-02-01', '--workers', '1', '--output', str(output)])
+
+    results = json.loads(output.read_text(encoding='utf-8'))
+    assert code == 1
+    assert results[0]['total'] == results[1]['total'] == pytest.approx(3.5)
+    assert results[0]['load_complete'] and results[1]['load_complete']
+    assert 'error' in results[2]
+    assert 'missing.json: error:' in capsys.readouterr().err
+
+
+def test_damaged_json_is_read_only_and_warned_about(tmp_path, capsys):
+    path = tmp_path / 'data.json'
+    write_json(path)
+    raw = path.read_bytes()
+    path.write_bytes(raw[:-40])
+    journal = tmp_path / 'data.json.journal'
+    journal.write_bytes(b'{"op": "rating", "date": "2025-02-0')
+
+    code = stats.main([str(path), '--date', '2025-02-01', '--format', 'csv'])
+
+    captured = capsys.readouterr()
+    rows = list(csv.reader(io.StringIO(captured.out)))
+    assert code == 0
+    assert [str(path), 'summary', '', 'load_complete', 'False'] in rows
+    assert any(row[1] == 'warning' for row in rows)
+    assert 'data.json: warning:' in captured.err
+    # Neither a .corrupt copy nor a cut journal
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['data.json', 'data.json.journal']
+    assert path.read_bytes() == raw[:-40]
+    assert journal.read_bytes() == b'{"op": "rating", "date": "2025-02-0'
+
+
+def test_sqlite_is_opened_read_only(tmp_path):
+    path = tmp_path / 'data.db'
+    backend = SqliteBackend(str(path))
+    backend.write_snapshot(backend.snapshot(DATA['global_tasks'], DATA['daily_ratings'],
+                                            DATA['workspaces']))
+    backend.close()
+    raw = path.read_bytes()
+
+    reader = SqliteBackend(str(path), read_only=True)
+    assert reader.load()['daily_ratings'] == DATA['daily_ratings']
+    with pytest.raises(sqlite3.OperationalError):
+        reader.write_snapshot(reader.snapshot({}, {}, []))
+    reader.close()
+    assert path.read_bytes() == raw
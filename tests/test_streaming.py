@@ -0,0 +1,112 @@
+"""StreamingJsonLoader: equivalence with json.load and recovery from truncation."""
+
+import json
+
+import pytest
+
+from storage import JsonBackend
+from storage.streaming import StreamingJsonLoader
+
+
+def make_snapshot(days=60):
+    return {
+        'global_tasks': {f't{i}': {'description': f'Задача {i}', 'workspace': 'Развитие',
+                                   'description_criteria': ''} for i in range(5)},
+        'workspaces': ['Развитие', 'CTF'],
+        'journal_seq': 7,
+        'daily_ratings': {f'2025-{1 + d // 28:02d}-{1 + d % 28:02d}':
+                          {f't{i}': (d + i) % 5 + 1 for i in range(d % 4 + 1)}
+                          for d in range(days)},
+    }
+
+
+def write(path, snapshot):
+    path.write_text(json.dumps(snapshot, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+@pytest.mark.parametrize('chunk_size', [7, 64, 1 << 16])
+def test_matches_json_load(tmp_path, chunk_size):
+    path = tmp_path / 'data.json'
+    snapshot = make_snapshot()
+    write(path, snapshot)
+    days = []
+
+    data, journal_seq, complete = StreamingJsonLoader(str(path), chunk_size=chunk_size).load(
+        lambda date_str, ratings: days.append(date_str))
+
+    assert complete
+    assert journal_seq == 7
+    assert data['global_tasks'] == snapshot['global_tasks']
+    assert data['workspaces'] == snapshot['workspaces']
+    assert data['daily_ratings'] == snapshot['daily_ratings']
+    assert days == list(snapshot['daily_ratings'])
+
+
+@pytest.mark.parametrize('fraction', [0.05, 0.3, 0.5, 0.75, 0.99])
+def test_truncated_file_keeps_parsed_prefix(tmp_path, fraction):
+    path = tmp_path / 'data.json'
+    snapshot = make_snapshot()
+    write(path, snapshot)
+    raw = path.read_bytes()
+    path.write_bytes(raw[:int(len(raw) * fraction)])
+
+    data, _, complete = StreamingJsonLoader(str(path), chunk_size=64).load()
+
+    assert not complete
+    # Every recovered day is intact and the days form a prefix of the original
+    assert list(data['daily_ratings']) == list(snapshot['daily_ratings'])[:len(data['daily_ratings'])]
+    for date_str, ratings in data['daily_ratings'].items():
+        assert ratings == snapshot['daily_ratings'][date_str]
+
+
+def test_backend_writes_metadata_first_and_keeps_corrupt_copy(tmp_path):
+    path = tmp_path / 'data.json'
+    snapshot = make_snapshot()
+    backend = JsonBackend(str(path), journaled=False)
+    backend.write_snapshot(backend.snapshot(snapshot['global_tasks'], snapshot['daily_ratings'],
+                                            snapshot['workspaces']))
+    raw = path.read_bytes()
+    path.write_bytes(raw[:len(raw) // 2])
+
+    data = backend.load()
+
+    assert not backend.load_complete
+    assert data['global_tasks'] == snapshot['global_tasks']
+    assert data['workspaces'] == snapshot['workspaces']
+    assert 0 < len(data['daily_ratings']) < len(snapshot['daily_ratings'])
+    assert (tmp_path / 'data.json.corrupt').read_bytes() == raw[:len(raw) // 2]
+
+
+def test_journal_replayed_after_streamed_snapshot(tmp_path):
+    path = tmp_path / 'data.json'
+    backend = JsonBackend(str(path))
+    backend.write_snapshot(backend.snapshot({}, {'2025-01-01': {'t': 2}}, ['W']))
+    backend.append_changes([{'op': 'rating', 'date': '2025-01-01', 'task_id': 't', 'rating': 5},
+                            {'op': 'rating', 'date': '2025-01-02', 'task_id': 't', 'rating': 1}])
+    days = {}
+
+    data = JsonBackend(str(path)).load(on_day=lambda date_str, ratings: days.update(
+        {date_str: dict(ratings)}))
+
+    assert data['daily_ratings'] == {'2025-01-01': {'t': 5}, '2025-01-02': {'t': 1}}
+    assert days == data['daily_ratings']
+
+
+def test_corruption_mid_file_stops_without_reading_on(tmp_path):
+    path = tmp_path / 'data.json'
+    snapshot = make_snapshot(days=400)
+    write(path, snapshot)
+    raw = path.read_bytes()
+    middle = raw.index(b'"2025-06-01"')
+    path.write_bytes(raw[:middle] + b'#' + raw[middle + 1:])
+    progress = []
+
+    data, _, complete = StreamingJsonLoader(str(path), on_progress=progress.append,
+                                            chunk_size=256).load()
+
+    assert not complete
+    assert '2025-05-28' in data['daily_ratings']
+    assert '2025-06-01' not in data['daily_ratings']
+    # The bad byte is reported as soon as it is decoded; the rest of the
+    # file is not read looking for the end of the value
+    assert progress[-2] < middle / len(raw) + 0.01
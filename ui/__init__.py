@@ -2,7 +2,12 @@
 
 from ui.styles import StyleManager
 from ui.dialogs import DialogManager
-from ui.components import CalendarComponent
+from ui.components import CalendarComponent, TaskListComponent, VirtualTaskList
+from ui.render_scheduler import RenderScheduler
 
-__all__ = ['StyleManager', 'DialogManager', 'CalendarComponent']
+__all__ = ['StyleManager', 'DialogManager', 'CalendarComponent', 'TaskListComponent',
+           'VirtualTaskList', 'RenderScheduler']
+
+# ui.heatmap is not imported here: it needs Pillow, and main.py loads it the
+# first time the heatmap is shown
 
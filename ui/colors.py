@@ -0,0 +1,85 @@
+"""Rating colour lookup tables shared by the calendar, tiles and task rows."""
+
+# Ratings are quantized to 0.01 steps over 0..5
+LUT_STEPS_PER_POINT = 100
+MAX_RATING = 5
+
+EMPTY_FILL = '#2a2a2a'  # Calendar circle of a day without ratings
+EMPTY_TEXT = '#888888'  # Label colour for "no rating" on dark backgrounds
+
+
+def _gradient(rating: float) -> str:
+    """Fill colour with a smooth red → orange → yellow → olive → green gradient."""
+    if rating < 2.0:
+        # Red to Orange: FF0000 → FF8000 (1.0 → 2.0)
+        progress = max(rating - 1.0, 0.0)
+        red, green = 255, int(progress * 128)
+    elif rating < 3.0:
+        # Orange to Yellow: FF8000 → FFFF00 (2.0 → 3.0)
+        progress = rating - 2.0
+        red, green = 255, int(128 + progress * 127)
+    elif rating < 4.0:
+        # Yellow to Olive green: FFFF00 → 808000 (3.0 → 4.0)
+        progress = rating - 3.0
+        red = green = int(255 - progress * 127)
+    else:
+        # Olive green to Bright green: 808000 → 00FF00 (4.0 → 5.0)
+        progress = rating - 4.0
+        red, green = int(128 - progress * 128), 255
+    return f'#{red:02x}{green:02x}00'
+
+
+def _contrast_text(rating: float) -> str:
+    """Dark text on bright fills (yellow range 2-4 and empty days), white otherwise."""
+    if rating == 0 or 2.0 <= rating < 4.0:
+        return '#000000'
+    return '#ffffff'
+
+
+def _build_luts():
+    fill, text = [], []
+    for step in range(MAX_RATING * LUT_STEPS_PER_POINT + 1):
+        rating = step / LUT_STEPS_PER_POINT
+        fill.append(_gradient(rating) if step > 0 else EMPTY_FILL)
+        text.append(_contrast_text(rating))
+    return tuple(fill), tuple(text)
+
+
+FILL_LUT, TEXT_LUT = _build_luts()
+_LAST_STEP = len(FILL_LUT) - 1
+
+
+def _step(rating: float) -> int:
+    step = int(rating * LUT_STEPS_PER_POINT + 0.5)
+    if step < 0:
+        return 0
+    return step if step < _LAST_STEP else _LAST_STEP
+
+
+def rating_fill(rating: float) -> str:
+    """Background fill for a rating (calendar circles)."""
+    return FILL_LUT[_step(rating)]
+
+
+def rating_text(rating: float) -> str:
+    """Text colour that contrasts with rating_fill(rating)."""
+    return TEXT_LUT[_step(rating)]
+
+
+def rating_color(rating: float) -> str:
+    """Foreground colour for a rating shown on a dark background (labels, tiles)."""
+    step = _step(rating)
+    return FILL_LUT[step] if step > 0 else EMPTY_TEXT
+
+
+def _rgb(hex_color: str):
+    return int(hex_color[1:3], 16), int(hex_color[3:5], 16), int(hex_color[5:7], 16)
+
+
+# Same fills as RGB tuples, for images drawn with Pillow
+FILL_RGB_LUT = tuple(_rgb(color) for color in FILL_LUT)
+
+
+def rating_fill_rgb(rating: float):
+    """rating_fill(rating) as an (r, g, b) tuple."""
+    return FILL_RGB_LUT[_step(rating)]
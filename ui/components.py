@@ -1,142 +1,273 @@
 """UI Components for Modern Task Manager."""
 
 import tkinter as tk
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
 
+import customtkinter as ctk
+
+from ui.colors import rating_color, rating_fill, rating_text
 from ui.styles import StyleManager
 
 
 class CalendarComponent:
-    """Handles calendar rendering and interactions."""
+    """
+    Handles calendar rendering and interactions.
+
+    The canvas holds a persistent 6x7 grid of items created once. Updates
+    only move items when the canvas size changes and reconfigure cells whose
+    date, rating or highlight changed. Clicks are resolved by a single
+    canvas-level handler that maps coordinates to cells.
+
+    Layout is driven by the canvas <Configure> event, coalesced to at most
+    one relayout per frame. Grid coordinates are cached per canvas size and
+    the cell-to-date mapping per month, so dragging the window edge or
+    switching between months only replays cached values.
+
+    Cell states (date, rating, today highlight) are kept per month in a
+    small LRU cache keyed by (year, month, data version), and prefetch()
+    fills it for the neighbouring months during idle time, so month
+    navigation only swaps in ready states.
+    """
+    
+    ROWS = 6
+    COLS = 7
+    HEADER_Y = 20
+    START_Y = 40
+    FRAME_MS = 16
+    CACHE_LIMIT = 32
+    STATE_CACHE_SIZE = 6
     
-    def __init__(self, style_manager: StyleManager, get_daily_rating_callback):
-        self.canvas = None  # Will be set from outside
+    def __init__(self, style_manager: StyleManager, get_daily_rating_callback,
+                 get_data_version: Callable[[], int] = None):
+        self.canvas = None  # Set through attach_canvas()
         self.style = style_manager
         self.get_daily_rating_callback = get_daily_rating_callback
+        self.get_data_version = get_data_version  # Without it states are not cached
         self.current_date = datetime.now()
+        self.on_day_click = None
+        
+        self._headers = []
+        self._cells = []  # per cell: dict of canvas item ids
+        self._cell_state = []  # per cell: last rendered (day_str, rating, is_today)
+        self._cell_dates = [None] * (self.ROWS * self.COLS)
+        self._geometry = None  # (canvas_width, canvas_height, start_x, cell_size)
+        self._grid_cache = {}  # (width, height) -> grid coordinates
+        self._month_cache = {}  # (year, month) -> day_str or None per cell
+        self._state_cache = OrderedDict()  # (year, month, version) -> (today, states)
+        self._size = (0, 0)
+        self._resize_job = None
+    
+    def attach_canvas(self, canvas):
+        """Use a canvas for drawing and relayout it whenever it is resized."""
+        self.canvas = canvas
+        canvas.bind('<Configure>', self._on_configure)
     
     def update_calendar(self, on_day_click_callback):
         """Update calendar display."""
-        self.canvas.delete("all")
         self.on_day_click = on_day_click_callback
         
-        # Calendar dimensions
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
+        # Calendar dimensions (tracked from <Configure>, queried before the first one)
+        canvas_width, canvas_height = self._size
+        if canvas_width <= 1:
+            canvas_width = self.canvas.winfo_width()
+            canvas_height = self.canvas.winfo_height()
         
-        if canvas_width <= 1:  # Canvas not yet rendered
+        if canvas_width <= 1:  # Canvas not yet rendered; <Configure> will redraw
             return
         
-        cell_size = min((canvas_width - 40) // 7, (canvas_height - 60) // 6)
-        start_x = (canvas_width - cell_size * 7) // 2
-        start_y = 40
+        if not self._cells:
+            self._create_items()
+        if self._geometry is None or self._geometry[:2] != (canvas_width, canvas_height):
+            self._layout(canvas_width, canvas_height)
+        
+        cell_dates = self._month_cells(self.current_date.year, self.current_date.month)
+        states = self._month_states(self.current_date.year, self.current_date.month)
+        
+        for index, (day_str, state) in enumerate(zip(cell_dates, states)):
+            self._cell_dates[index] = day_str
+            if self._cell_state[index] != state:
+                self._render_cell(index, state)
+                self._cell_state[index] = state
+    
+    def _on_configure(self, event):
+        """Remember the new size and schedule one relayout for this frame."""
+        self._size = (event.width, event.height)
+        if self._resize_job is None:
+            self._resize_job = self.canvas.after(self.FRAME_MS, self._apply_resize)
+    
+    def _apply_resize(self):
+        self._resize_job = None
+        if self.on_day_click is not None:
+            self.update_calendar(self.on_day_click)
+    
+    def _month_cells(self, year: int, month: int) -> List:
+        """Date string (or None) for each of the 42 cells of a month, cached."""
+        key = (year, month)
+        cells = self._month_cache.get(key)
+        if cells is None:
+            first_day = datetime(year, month, 1)
+            last_day = datetime(year, month + 1, 1) - timedelta(days=1) if month < 12 else datetime(year + 1, 1, 1) - timedelta(days=1)
+            
+            # Python weekday: Monday=0, Sunday=6
+            # We want to show Sunday-Saturday
+            start_col = (first_day.weekday() + 1) % 7  # Convert to Sun=0, Mon=1...
+            prefix = first_day.strftime("%Y-%m-")
+            cells = []
+            for index in range(self.ROWS * self.COLS):
+                day_number = index - start_col + 1
+                cells.append(f"{prefix}{day_number:02d}" if 1 <= day_number <= last_day.day
+                             else None)
+            if len(self._month_cache) >= self.CACHE_LIMIT:
+                self._month_cache.clear()
+            self._month_cache[key] = cells
+        return cells
+    
+    def _month_states(self, year: int, month: int) -> List:
+        """(day_str, rating, is_today) or None for each cell of a month, LRU cached."""
+        today_str = datetime.now().strftime("%Y-%m-%d")
+        key = None
+        if self.get_data_version is not None:
+            key = (year, month, self.get_data_version())
+            entry = self._state_cache.get(key)
+            if entry is not None and entry[0] == today_str:
+                self._state_cache.move_to_end(key)
+                return entry[1]
         
+        states = [(day_str, self.get_daily_rating_callback(day_str), day_str == today_str)
+                  if day_str is not None else None
+                  for day_str in self._month_cells(year, month)]
+        if key is None:
+            return states
+        self._state_cache[key] = (today_str, states)
+        self._state_cache.move_to_end(key)
+        while len(self._state_cache) > self.STATE_CACHE_SIZE:
+            self._state_cache.popitem(last=False)
+        return states
+    
+    def adjacent_months(self) -> List[Tuple[int, int]]:
+        """(year, month) of the months before and after the shown one."""
+        year, month = self.current_date.year, self.current_date.month
+        previous = (year, month - 1) if month > 1 else (year - 1, 12)
+        following = (year, month + 1) if month < 12 else (year + 1, 1)
+        return [previous, following]
+    
+    def prefetch(self, months: List[Tuple[int, int]]):
+        """Compute and cache cell states of months that may be shown next."""
+        for year, month in months:
+            self._month_states(year, month)
+    
+    def _create_items(self):
+        """Create header and cell items once; they are reused by every update."""
         # Day headers (Sunday = 6, Monday = 0 in Python)
         # But we show Monday first
         days = ['Вс', 'Пн', 'Вт', 'Ср', 'Чт', 'Пт', 'Сб']
-        for i, day in enumerate(days):
-            x = start_x + i * cell_size + cell_size // 2
-            self.canvas.create_text(x, start_y - 20, text=day, 
-                                   fill=self.style.text_secondary_color,
-                                   font=('Arial', 12, 'bold'))
+        for day in days:
+            self._headers.append(self.canvas.create_text(0, 0, text=day,
+                                                         fill=self.style.text_secondary_color,
+                                                         font=('Arial', 12, 'bold')))
+        for _ in range(self.ROWS * self.COLS):
+            self._cells.append({
+                'highlight': self.canvas.create_oval(0, 0, 0, 0, fill=self.style.accent_color,
+                                                     outline="", state="hidden"),
+                'circle': self.canvas.create_oval(0, 0, 0, 0, fill='#2a2a2a',
+                                                  outline="", state="hidden"),
+                'day': self.canvas.create_text(0, 0, text="", font=('Arial', 12, 'bold'),
+                                               state="hidden"),
+                'rating': self.canvas.create_text(0, 0, text="", font=('Arial', 10),
+                                                  state="hidden"),
+            })
+            self._cell_state.append(None)
+        self.canvas.bind('<Button-1>', self._on_canvas_click)
+    
+    def _layout(self, canvas_width: int, canvas_height: int):
+        """Move all items to the grid positions for the current canvas size."""
+        grid = self._grid_geometry(canvas_width, canvas_height)
+        self._geometry = (canvas_width, canvas_height, grid['start_x'], grid['cell_size'])
+        
+        for item, coords in zip(self._headers, grid['headers']):
+            self.canvas.coords(item, *coords)
+        for items, cell_coords in zip(self._cells, grid['cells']):
+            for name, coords in cell_coords.items():
+                self.canvas.coords(items[name], *coords)
+    
+    def _grid_geometry(self, canvas_width: int, canvas_height: int) -> dict:
+        """Header and cell item coordinates for a canvas size, cached."""
+        key = (canvas_width, canvas_height)
+        grid = self._grid_cache.get(key)
+        if grid is not None:
+            return grid
         
-        # Get month data
-        year = self.current_date.year
-        month = self.current_date.month
+        cell_size = min((canvas_width - 40) // 7, (canvas_height - 60) // 6)
+        start_x = (canvas_width - cell_size * 7) // 2
+        headers = [(start_x + i * cell_size + cell_size // 2, self.START_Y - self.HEADER_Y)
+                   for i in range(self.COLS)]
         
-        first_day = datetime(year, month, 1)
-        last_day = datetime(year, month + 1, 1) - timedelta(days=1) if month < 12 else datetime(year + 1, 1, 1) - timedelta(days=1)
+        radius = cell_size // 2 - 5
+        cells = []
+        for index in range(self.ROWS * self.COLS):
+            row, col = divmod(index, self.COLS)
+            x = start_x + col * cell_size + cell_size // 2
+            y = self.START_Y + row * cell_size + cell_size // 2
+            cells.append({
+                'highlight': (x-radius-2, y-radius-2, x+radius+2, y+radius+2),
+                'circle': (x-radius, y-radius, x+radius, y+radius),
+                'day': (x, y-8),
+                'rating': (x, y+8),
+            })
         
-        # Python weekday: Monday=0, Sunday=6
-        # We want to show Sunday-Saturday
-        start_col = (first_day.weekday() + 1) % 7  # Convert to Sun=0, Mon=1...
-        current_day = first_day
+        grid = {'start_x': start_x, 'cell_size': cell_size,
+                'headers': headers, 'cells': cells}
+        if len(self._grid_cache) >= self.CACHE_LIMIT:
+            self._grid_cache.clear()
+        self._grid_cache[key] = grid
+        return grid
+    
+    def _render_cell(self, index: int, state):
+        """Reconfigure one cell's items for (day_str, rating, is_today) or hide it."""
+        items = self._cells[index]
+        if state is None:
+            for item in items.values():
+                self.canvas.itemconfigure(item, state="hidden")
+            return
         
-        # Draw days
-        row = 0
-        col = start_col
+        day_str, rating, is_today = state
+        color = rating_fill(rating)
+        text_color = rating_text(rating)
         
-        while current_day <= last_day:
-            day_str = current_day.strftime("%Y-%m-%d")
-            day_number = current_day.day
-            
-            x = start_x + col * cell_size + cell_size // 2
-            y = start_y + row * cell_size + cell_size // 2
-            
-            # Day circle
-            radius = cell_size // 2 - 5
-            rating = self.get_daily_rating_callback(day_str)
-            
-            # Color based on rating with smooth gradient every 0.1
-            if rating > 0:
-                if rating < 2.0:
-                    # Red to Orange: FF0000 → FF8000 (1.0 → 2.0)
-                    progress = (rating - 1.0) / 1.0
-                    red = 255
-                    green = int(0 + progress * 128)  # 0 → 128
-                    blue = 0
-                    color = f'#{red:02x}{green:02x}{blue:02x}'
-                elif rating < 3.0:
-                    # Orange to Yellow: FF8000 → FFFF00 (2.0 → 3.0)
-                    progress = (rating - 2.0) / 1.0
-                    red = 255
-                    green = int(128 + progress * 127)  # 128 → 255
-                    blue = 0
-                    color = f'#{red:02x}{green:02x}{blue:02x}'
-                elif rating < 4.0:
-                    # Yellow to Olive green: FFFF00 → 808000 (3.0 → 4.0)
-                    progress = (rating - 3.0) / 1.0
-                    red = int(255 - progress * 127)  # 255 → 128
-                    green = int(255 - progress * 127)  # 255 → 128
-                    blue = 0
-                    color = f'#{red:02x}{green:02x}{blue:02x}'
-                else:
-                    # Olive green to Bright green: 808000 → 00FF00 (4.0 → 5.0)
-                    progress = (rating - 4.0) / 1.0
-                    red = int(128 - progress * 128)  # 128 → 0
-                    green = 255
-                    blue = 0
-                    color = f'#{red:02x}{green:02x}{blue:02x}'
-            else:
-                color = '#2a2a2a'
-            
-            # Highlight current day
-            if current_day.date() == datetime.now().date():
-                self.canvas.create_oval(x-radius-2, y-radius-2, 
-                                       x+radius+2, y+radius+2,
-                                       fill=self.style.accent_color, outline="")
-            
-            # Day circle
-            day_circle = self.canvas.create_oval(x-radius, y-radius, x+radius, y+radius,
-                                               fill=color, outline="")
-            
-            # Determine text color based on background brightness
-            # If rating is bright (yellow range 2-4), use dark text
-            text_color = '#000000' if 2.0 <= rating < 4.0 else '#ffffff'
-            text_color = '#000000' if rating == 0 else text_color
-            
-            # Day number
-            self.canvas.create_text(x, y-8, text=str(day_number),
-                                   fill=text_color,
-                                   font=('Arial', 12, 'bold'))
-            
-            # Rating
-            if rating > 0:
-                self.canvas.create_text(x, y+8, text=f"{rating:.1f}",
-                                       fill=text_color,
-                                       font=('Arial', 10))
-            
-            # Bind click event with proper closure
-            def make_click_handler(day):
-                return lambda e: self.on_day_click(day)
-            
-            self.canvas.tag_bind(day_circle, '<Button-1>', make_click_handler(day_str))
-            
-            current_day += timedelta(days=1)
-            col += 1
-            if col > 6:
-                col = 0
-                row += 1
+        # Highlight current day
+        self.canvas.itemconfigure(items['highlight'],
+                                  state="normal" if is_today else "hidden")
+        self.canvas.itemconfigure(items['circle'], fill=color, state="normal")
+        self.canvas.itemconfigure(items['day'], text=str(int(day_str[8:])),
+                                  fill=text_color, state="normal")
+        if rating > 0:
+            self.canvas.itemconfigure(items['rating'], text=f"{rating:.1f}",
+                                      fill=text_color, state="normal")
+        else:
+            self.canvas.itemconfigure(items['rating'], state="hidden")
+    
+    def _on_canvas_click(self, event):
+        """Map a click position to a calendar cell and report its day."""
+        if self._geometry is None or self.on_day_click is None:
+            return
+        _, _, start_x, cell_size = self._geometry
+        if cell_size <= 0:
+            return
+        col = (event.x - start_x) // cell_size
+        row = (event.y - self.START_Y) // cell_size
+        if not (0 <= col < self.COLS and 0 <= row < self.ROWS):
+            return
+        # Only clicks inside the day circle count, as before
+        center_x = start_x + col * cell_size + cell_size // 2
+        center_y = self.START_Y + row * cell_size + cell_size // 2
+        radius = cell_size // 2 - 5
+        if (event.x - center_x) ** 2 + (event.y - center_y) ** 2 > radius ** 2:
+            return
+        day_str = self._cell_dates[row * self.COLS + col]
+        if day_str is not None:
+            self.on_day_click(day_str)
     
     def get_month_label_text(self) -> str:
         """Get formatted month/year label text."""
@@ -158,3 +289,246 @@ class CalendarComponent:
         """Navigate to current month."""
         self.current_date = datetime.now()
 
+
+
+class TaskRow:
+    """
+    One reusable task row: a frame with name, rating, edit and delete widgets.
+
+    The widgets are created once; show() reconfigures them in place and
+    only touches the options whose values changed. Callbacks read the
+    row's current task id, so they never need rebinding.
+    """
+
+    _fonts = None
+
+    def __init__(self, parent, on_click: Callable[[str], None],
+                 on_edit: Callable[[str], None], on_delete: Callable[[str], None],
+                 height: Optional[int] = None):
+        """
+        Args:
+            parent: Parent widget
+            on_click, on_edit, on_delete: Called with the row's task id
+            height: Fixed row height (rows placed at fixed slots); by default
+                the row takes the height of its content
+        """
+        self.task_id = None
+        self._state = {}
+        self.packed = False
+        fonts = self._get_fonts()
+
+        if height is None:
+            self.frame = ctk.CTkFrame(parent)
+        else:
+            # CTk widgets take their size only in the constructor, and the
+            # packed content must not shrink the frame back to its own height
+            self.frame = ctk.CTkFrame(parent, height=height)
+            self.frame.pack_propagate(False)
+
+        # Main content in one line
+        content_frame = ctk.CTkFrame(self.frame, fg_color="transparent")
+        content_frame.pack(fill="x", padx=8, pady=6)
+
+        self.task_label = ctk.CTkLabel(content_frame, text="",
+                                       font=fonts['task'],
+                                       text_color="#00d4ff")
+        self.task_label.pack(side="left", padx=(0, 8))
+
+        self.rating_label = ctk.CTkLabel(content_frame, text="?",
+                                         font=fonts['rating'],
+                                         text_color=rating_color(0),
+                                         width=40)
+        self.rating_label.pack(side="right")
+
+        # Edit button (small)
+        ctk.CTkButton(content_frame, text="✎",
+                      font=fonts['edit'],
+                      width=24, height=24,
+                      fg_color="#2a2a2a",
+                      hover_color="#3a3a3a",
+                      command=lambda: on_edit(self.task_id)).pack(side="right", padx=(0, 8))
+
+        # Delete button (small)
+        ctk.CTkButton(content_frame, text="✕",
+                      font=fonts['delete'],
+                      width=24, height=24,
+                      fg_color="#e94560",
+                      hover_color="#d63031",
+                      command=lambda: on_delete(self.task_id)).pack(side="right", padx=(0, 8))
+
+        # Bind click events for rating
+        self.widgets = [self.frame, content_frame, self.task_label, self.rating_label]
+        for widget in self.widgets:
+            widget.bind("<Button-1>", lambda e: on_click(self.task_id))
+
+    @classmethod
+    def _get_fonts(cls):
+        """Fonts shared by all rows (created after the root window exists)."""
+        if cls._fonts is None:
+            cls._fonts = {
+                'task': ctk.CTkFont(family="Segoe UI", size=13, weight="bold"),
+                'rating': ctk.CTkFont(size=12, weight="bold"),
+                'edit': ctk.CTkFont(size=10),
+                'delete': ctk.CTkFont(size=11, weight="bold"),
+            }
+        return cls._fonts
+
+    def set(self, task_id: str, description: str, rating: int):
+        """Point the row at a task and update the widgets that changed."""
+        self.task_id = task_id
+        if self._state.get('description') != description:
+            self.task_label.configure(text=description)
+            self._state['description'] = description
+        if self._state.get('rating') != rating:
+            self.rating_label.configure(text=f"{rating}/5" if rating > 0 else "?",
+                                        text_color=rating_color(rating))
+            self._state['rating'] = rating
+
+    def show(self, task_id: str, description: str, rating: int):
+        """Update the row and pack it after the rows already shown."""
+        self.set(task_id, description, rating)
+        if not self.packed:
+            self.frame.pack(fill="x", pady=3)
+            self.packed = True
+
+    def hide(self):
+        """Remove the row from the layout, keeping it for reuse."""
+        if self.packed:
+            self.frame.pack_forget()
+            self.packed = False
+
+
+class TaskListComponent:
+    """
+    Task list rendered from a pool of recycled TaskRow widgets.
+
+    Row i always shows the i-th task, so visible rows stay packed in order
+    and only rows whose task, text or rating changed are reconfigured.
+    Surplus rows are hidden and kept for later renders.
+    """
+
+    def __init__(self, parent, on_click: Callable[[str], None],
+                 on_edit: Callable[[str], None], on_delete: Callable[[str], None]):
+        self.parent = parent
+        self.on_click = on_click
+        self.on_edit = on_edit
+        self.on_delete = on_delete
+        self.rows: List[TaskRow] = []
+
+    def render(self, items: List[Tuple[str, str, int]]):
+        """
+        Show the given tasks.
+
+        Args:
+            items: (task_id, description, rating) tuples in display order
+        """
+        for i, (task_id, description, rating) in enumerate(items):
+            if i == len(self.rows):
+                self.rows.append(TaskRow(self.parent, self.on_click,
+                                         self.on_edit, self.on_delete))
+            self.rows[i].show(task_id, description, rating)
+        for row in self.rows[len(items):]:
+            row.hide()
+
+
+class VirtualTaskList:
+    """
+    Windowed task list for workspaces with thousands of tasks.
+
+    Only the rows covering the viewport plus a small overscan exist; they
+    are placed at fixed-height slots and reassigned to other tasks while
+    scrolling, so memory and scroll cost do not depend on the task count.
+    Exposes the same render() as TaskListComponent.
+    """
+
+    ROW_HEIGHT = 42
+    ROW_GAP = 6
+    OVERSCAN = 2
+
+    def __init__(self, parent, on_click: Callable[[str], None],
+                 on_edit: Callable[[str], None], on_delete: Callable[[str], None]):
+        self.on_click = on_click
+        self.on_edit = on_edit
+        self.on_delete = on_delete
+        self.items: List[Tuple[str, str, int]] = []
+        self.rows: List[TaskRow] = []
+        self.offset = 0
+
+        self.frame = ctk.CTkFrame(parent)
+        self.scrollbar = ctk.CTkScrollbar(self.frame, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.viewport = ctk.CTkFrame(self.frame, fg_color="transparent")
+        self.viewport.pack(side="left", fill="both", expand=True)
+        self.viewport.bind("<Configure>", lambda e: self._refresh())
+        self._bind_wheel(self.viewport)
+
+    def render(self, items: List[Tuple[str, str, int]]):
+        """
+        Show the given tasks.
+
+        Args:
+            items: (task_id, description, rating) tuples in display order
+        """
+        self.items = items
+        self._refresh()
+
+    def scroll_to(self, offset: int):
+        """Scroll so that the given pixel offset is at the top of the viewport."""
+        max_offset = max(0, len(self.items) * self.ROW_HEIGHT - self._viewport_height())
+        offset = max(0, min(int(offset), max_offset))
+        if offset != self.offset:
+            self.offset = offset
+            self._refresh()
+
+    def _viewport_height(self) -> int:
+        height = self.viewport.winfo_height()
+        return height if height > 1 else 400
+
+    def _refresh(self):
+        height = self._viewport_height()
+        max_offset = max(0, len(self.items) * self.ROW_HEIGHT - height)
+        self.offset = min(self.offset, max_offset)
+
+        first = max(0, self.offset // self.ROW_HEIGHT - self.OVERSCAN)
+        last = min(len(self.items),
+                   (self.offset + height) // self.ROW_HEIGHT + 1 + self.OVERSCAN)
+        needed = last - first
+        while len(self.rows) < needed:
+            row = TaskRow(self.viewport, self.on_click, self.on_edit, self.on_delete,
+                          height=self.ROW_HEIGHT - self.ROW_GAP)
+            for widget in row.widgets:
+                self._bind_wheel(widget)
+            self.rows.append(row)
+
+        for slot, index in enumerate(range(first, last)):
+            row = self.rows[slot]
+            row.set(*self.items[index])
+            row.frame.place(x=0, y=index * self.ROW_HEIGHT - self.offset, relwidth=1.0)
+        for row in self.rows[needed:]:
+            row.frame.place_forget()
+
+        total = len(self.items) * self.ROW_HEIGHT
+        if total <= height:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + height) / total)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(value) * len(self.items) * self.ROW_HEIGHT)
+        elif action == "scroll":
+            step = self._viewport_height() if unit == "pages" else self.ROW_HEIGHT
+            self.scroll_to(self.offset + int(value) * step)
+
+    def _on_wheel(self, event):
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        else:
+            steps = -1 if event.delta > 0 else 1
+        self.scroll_to(self.offset + steps * self.ROW_HEIGHT)
+
+    def _bind_wheel(self, widget):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            widget.bind(sequence, self._on_wheel, add="+")
@@ -1,7 +1,6 @@
 """Dialog windows for Modern Task Manager using CustomTkinter."""
 
 import customtkinter as ctk
-import tkinter.messagebox as messagebox
 from ui.styles import StyleManager
 
 
@@ -111,10 +110,12 @@ class DialogManager:
     
     def show_warning(self, title: str, message: str):
         """Show warning messagebox."""
+        import tkinter.messagebox as messagebox
         messagebox.showwarning(title, message)
     
     def show_error(self, title: str, message: str):
         """Show error messagebox."""
+        import tkinter.messagebox as messagebox
         messagebox.showerror(title, message)
     
     def ask_confirmation(self, title: str, message: str) -> bool:
@@ -124,4 +125,5 @@ class DialogManager:
         Returns:
             True if confirmed, False otherwise
         """
+        import tkinter.messagebox as messagebox
         return messagebox.askyesno(title, message)
@@ -0,0 +1,174 @@
+"""Year heatmap rasterized into a single image."""
+
+import tkinter as tk
+from datetime import date, timedelta
+from typing import Callable, Dict, Optional
+
+import customtkinter as ctk
+from PIL import Image, ImageTk
+
+from ui.colors import rating_fill_rgb
+
+
+class YearHeatmap:
+    """
+    GitHub-style heatmap of the last 365 days drawn as one PhotoImage.
+
+    Columns are weeks and rows are weekdays, Sunday first like the calendar.
+    The first render rasterizes every day at once. Each day becomes one pixel
+    set with putdata(), the image is scaled up with NEAREST, and a cached
+    mask paints the gaps between cells. Later renders compare each day's
+    colour with the drawn one, repaint only the cells that changed, and push
+    the image into the same PhotoImage. The canvas holds a single image item.
+    Hover and click are mapped to days by coordinate math.
+    """
+
+    DAYS = 365
+    ROWS = 7
+    CELL = 8
+    GAP = 2
+    BACKGROUND = (26, 26, 46)  # '#1a1a2e', same as the calendar canvas
+
+    def __init__(self, parent, get_rating: Callable[[date], float],
+                 on_day_click: Callable[[str], None]):
+        """
+        Args:
+            parent: Parent widget
+            get_rating: Average rating of a day (0.0 if unrated)
+            on_day_click: Called with the clicked day as YYYY-MM-DD
+        """
+        self.get_rating = get_rating
+        self.on_day_click = on_day_click
+
+        self.frame = ctk.CTkFrame(parent, fg_color="transparent")
+        self.canvas = tk.Canvas(self.frame, bg="#1a1a2e", highlightthickness=0, borderwidth=0,
+                                width=0, height=self.ROWS * self._pitch())
+        self.canvas.pack(anchor="w")
+        self.info_label = ctk.CTkLabel(self.frame, text="", font=ctk.CTkFont(size=11))
+        self.info_label.pack(anchor="w")
+        self.canvas.bind('<Motion>', self._on_motion)
+        self.canvas.bind('<Leave>', lambda e: self._show_info(None))
+        self.canvas.bind('<Button-1>', self._on_click)
+
+        self._image = None
+        self._photo = None
+        self._item = None
+        self._first = None  # first and last shown day
+        self._last = None
+        self._grid_start = 0  # ordinal of the day in column 0, row 0
+        self._colors: Dict[int, tuple] = {}  # ordinal -> drawn colour
+        self._masks = {}  # columns -> gap mask
+        self._hovered = None
+
+    @classmethod
+    def _pitch(cls) -> int:
+        return cls.CELL + cls.GAP
+
+    def render(self, last: Optional[date] = None):
+        """Draw the 365 days ending on ``last`` (default today), repainting only changes."""
+        last = last or date.today()
+        if self._image is None or last != self._last:
+            self._rebuild(last)
+            return
+
+        pitch = self._pitch()
+        changed = False
+        for ordinal, color in self._colors.items():
+            new_color = rating_fill_rgb(self.get_rating(date.fromordinal(ordinal)))
+            if new_color != color:
+                col, row = divmod(ordinal - self._grid_start, self.ROWS)
+                x, y = col * pitch, row * pitch
+                self._image.paste(new_color, (x, y, x + self.CELL, y + self.CELL))
+                self._colors[ordinal] = new_color
+                changed = True
+        if changed:
+            self._photo.paste(self._image)
+
+    def _rebuild(self, last: date):
+        """Rasterize every day of the range ending on ``last``."""
+        first = last - timedelta(days=self.DAYS - 1)
+        grid_start = first - timedelta(days=(first.weekday() + 1) % 7)  # back to Sunday
+        self._first, self._last = first, last
+        self._grid_start = grid_start.toordinal()
+        cols = (last - grid_start).days // self.ROWS + 1
+
+        first_ordinal, last_ordinal = first.toordinal(), last.toordinal()
+        self._colors = {}
+        pixels = []
+        for row in range(self.ROWS):
+            for col in range(cols):
+                ordinal = self._grid_start + col * self.ROWS + row
+                if first_ordinal <= ordinal <= last_ordinal:
+                    color = rating_fill_rgb(self.get_rating(date.fromordinal(ordinal)))
+                    self._colors[ordinal] = color
+                else:
+                    color = self.BACKGROUND
+                pixels.append(color)
+
+        cells = Image.new('RGB', (cols, self.ROWS))
+        cells.putdata(pixels)
+        pitch = self._pitch()
+        size = (cols * pitch, self.ROWS * pitch)
+        image = cells.resize(size, Image.Resampling.NEAREST)
+        image.paste(self.BACKGROUND, (0, 0) + size, self._gap_mask(cols))
+        self._image = image
+
+        if self._photo is None or (self._photo.width(), self._photo.height()) != size:
+            self._photo = ImageTk.PhotoImage(image)
+            if self._item is None:
+                self._item = self.canvas.create_image(0, 0, anchor="nw", image=self._photo)
+            else:
+                self.canvas.itemconfigure(self._item, image=self._photo)
+            self.canvas.configure(width=size[0], height=size[1])
+        else:
+            self._photo.paste(image)
+
+    def _gap_mask(self, cols: int):
+        """Mask (255 = gap) of the spacing between cells, cached per column count."""
+        mask = self._masks.get(cols)
+        if mask is None:
+            pitch = self._pitch()
+            width, height = cols * pitch, self.ROWS * pitch
+            mask = Image.new('L', (width, height), 0)
+            for col in range(cols):
+                x = col * pitch + self.CELL
+                mask.paste(255, (x, 0, x + self.GAP, height))
+            for row in range(self.ROWS):
+                y = row * pitch + self.CELL
+                mask.paste(255, (0, y, width, y + self.GAP))
+            self._masks[cols] = mask
+        return mask
+
+    def day_at(self, x: int, y: int) -> Optional[date]:
+        """Day under a canvas position, or None for gaps and days outside the range."""
+        if self._first is None or x < 0 or y < 0:
+            return None
+        pitch = self._pitch()
+        col, offset_x = divmod(x, pitch)
+        row, offset_y = divmod(y, pitch)
+        if row >= self.ROWS or offset_x >= self.CELL or offset_y >= self.CELL:
+            return None
+        ordinal = self._grid_start + col * self.ROWS + row
+        if ordinal not in self._colors:
+            return None
+        return date.fromordinal(ordinal)
+
+    def _on_motion(self, event):
+        self._show_info(self.day_at(event.x, event.y))
+
+    def _show_info(self, day: Optional[date]):
+        """Show the hovered day's rating under the heatmap (only when the day changes)."""
+        if day == self._hovered:
+            return
+        self._hovered = day
+        if day is None:
+            self.info_label.configure(text="")
+            return
+        rating = self.get_rating(day)
+        value = f"{rating:.1f}" if rating > 0 else "нет оценок"
+        self.info_label.configure(text=f"{day.strftime('%d.%m.%Y')}: {value}")
+
+    def _on_click(self, event):
+        day = self.day_at(event.x, event.y)
+        if day is not None:
+            self.on_day_click(day.isoformat())
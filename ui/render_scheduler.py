@@ -0,0 +1,54 @@
+"""Coalescing redraw scheduler for the main window."""
+
+from typing import Callable, Dict
+
+
+class RenderScheduler:
+    """
+    Redraws dirty UI regions once per idle pass.
+
+    Mutations call mark_dirty() with the regions they affect instead of
+    redrawing directly. The first mark schedules a single ``after_idle``
+    pass; further marks before it runs only add regions, so each dirty
+    region is redrawn exactly once however many mutations happened.
+    Regions are redrawn in the order the renderers were given.
+    """
+
+    def __init__(self, renderers: Dict[str, Callable[[], None]],
+                 schedule_idle: Callable, cancel: Callable):
+        """
+        Args:
+            renderers: Region name -> function that redraws it, in redraw order
+            schedule_idle: ``after_idle(func)``-style function returning an id
+            cancel: ``after_cancel(id)``-style function
+        """
+        self.renderers = renderers
+        self.schedule_idle = schedule_idle
+        self.cancel = cancel
+        self._dirty = set()
+        self._job = None
+
+    def mark_dirty(self, *regions: str):
+        """Mark regions for redraw (all regions if none are given)."""
+        for region in regions or self.renderers:
+            if region not in self.renderers:
+                raise KeyError(f"Unknown render region: {region}")
+            self._dirty.add(region)
+        if self._job is None and self._dirty:
+            self._job = self.schedule_idle(self._run)
+
+    def is_dirty(self, region: str) -> bool:
+        return region in self._dirty
+
+    def flush(self):
+        """Redraw dirty regions now instead of waiting for idle time."""
+        if self._job is not None:
+            self.cancel(self._job)
+        self._run()
+
+    def _run(self):
+        self._job = None
+        dirty, self._dirty = self._dirty, set()
+        for region, render in self.renderers.items():
+            if region in dirty:
+                render()